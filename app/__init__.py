@@ -4,6 +4,12 @@ from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 from flask_cors import CORS
 from .config import Config
+from .auth.token_blocklist import blocklist
+from .auth.password_hasher import passwords, HashingUnavailable
+from .auth.session_snapshot import security_versions
+from .services.suggestion_cache import suggestion_cache
+from .services.attachment_store import attachment_store
+from .services.admin_stats import admin_stats
 
 db = SQLAlchemy()
 jwt = JWTManager()
@@ -17,20 +23,24 @@ def create_app():
     CORS(
         app,
         supports_credentials=True,
-        origins=Config.FRONTEND_ORIGINS
+        origins=Config.FRONTEND_ORIGINS,
+        expose_headers=["X-Next-Cursor"]
     )
 
     # ---------- Init extensions ----------
     db.init_app(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
+    passwords.init_app(app)
+    attachment_store.init_app(app)
 
     # ---------- Blueprints ----------
     from app.controllers import (
         user_controller,
         job_controller,
         freelancer_controller,
-        admin_controller
+        admin_controller,
+        search_controller
     )
     from app.controllers.manager_controller import bp as manager_bp
 
@@ -38,6 +48,7 @@ def create_app():
     app.register_blueprint(job_controller.bp)
     app.register_blueprint(freelancer_controller.bp)
     app.register_blueprint(admin_controller.bp)
+    app.register_blueprint(search_controller.bp)
     app.register_blueprint(manager_bp)
 
     from app.controllers.job_invoice_controller import (
@@ -50,20 +61,35 @@ def create_app():
     app.register_blueprint(manager_invoice_bp)
     app.register_blueprint(admin_invoice_bp)
 
+    # ---------- Errors ----------
+    @app.errorhandler(HashingUnavailable)
+    def hashing_unavailable(e):
+        from app.utils.response import error_response
+        return error_response(str(e), 503)
+
+    # ---------- CLI ----------
+    from app.cli import register_commands
+    register_commands(app)
+
     # ---------- Token revocation ----------
+    blocklist.init_app(app)
+    security_versions.init_app(app)
+    suggestion_cache.init_app(app)
+    admin_stats.init_app(app)
+
+    from app.services.token_cleanup_service import start_prune_scheduler
+    start_prune_scheduler(app)
+
     with app.app_context():
-        from app.models.revoked_token import RevokedToken
 
         @jwt.token_in_blocklist_loader
         def check_if_token_revoked(jwt_header, jwt_payload):
             """
             Checks if the JWT token is revoked.
-            Automatically called by flask_jwt_extended.
+            Automatically called by flask_jwt_extended; answered from the
+            per-worker blocklist cache, falling back to the DB on a miss.
             """
-            jti = jwt_payload.get("jti")
-            if not jti:
-                return True  # invalid token considered revoked
-            return RevokedToken.query.filter_by(jti=jti).first() is not None
+            return blocklist.is_revoked(jwt_payload.get("jti"))
 
         # Suppress Pylance unused warning
         _ = check_if_token_revoked
@@ -1,40 +1,115 @@
+from functools import wraps
+from flask import g
 from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
+    get_jwt,
     get_jwt_identity,
     verify_jwt_in_request
 )
 from datetime import timedelta
+from app.auth.session_snapshot import build_snapshot
+from app.utils.response import error_response
+
+ACCESS_TOKEN_LIFETIME = timedelta(minutes=59)  # Access token valid for 59 minutes
+REFRESH_TOKEN_LIFETIME = timedelta(days=7)     # Refresh token valid for 7 days
+
+
+def _user_claims(user):
+    return {"role": user.role, "usr": build_snapshot(user)}
 
 
 def generate_tokens(user):
     """
     Generates a fresh access token and refresh token for the given user.
-    Tokens include the user's role as an additional claim.
+    Tokens include the user's role and a versioned user snapshot ("usr")
+    so session checks can be answered from the token alone.
+    """
+    return _issue_tokens(str(user.id), _user_claims(user))
+
+
+def reissue_tokens(claims):
+    """
+    Generates a fresh token pair from an already-verified token's claims
+    (refresh rotation when its snapshot is still current).
+    """
+    return _issue_tokens(claims["sub"], {"role": claims.get("role"), "usr": claims["usr"]})
+
+
+def generate_access_token(user):
     """
-    identity = str(user.id)
-    claims = {"role": user.role}
+    Generates only an access token for the given user.
+    """
+    return create_access_token(
+        identity=str(user.id),
+        additional_claims=_user_claims(user),
+        expires_delta=ACCESS_TOKEN_LIFETIME
+    )
+
 
+def _issue_tokens(identity, claims):
     access_token = create_access_token(
         identity=identity,
         additional_claims=claims,
-        expires_delta=timedelta(minutes=59)  # Access token valid for 59 minutes
+        expires_delta=ACCESS_TOKEN_LIFETIME
     )
 
     refresh_token = create_refresh_token(
         identity=identity,
         additional_claims=claims,
-        expires_delta=timedelta(days=7)     # Refresh token valid for 7 days
+        expires_delta=REFRESH_TOKEN_LIFETIME
     )
 
     return access_token, refresh_token
 
 
-def get_current_manager_id():
+def role_required(*roles):
     """
-    Returns the currently logged-in manager's user ID from JWT.
-    Must be called inside a Flask route protected with @jwt_required() or verify_jwt_in_request().
+    Verifies the JWT exactly once for the request and stores the caller's
+    identity and role on `g` (g.user_id, g.role).
+    With no roles given, any authenticated user is accepted.
+    """
+    allowed = {r.lower() for r in roles}
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if verify_jwt_in_request() is None:
+                return fn(*args, **kwargs)  # exempt method (e.g. OPTIONS)
+
+            g.user_id = int(get_jwt_identity())
+            g.role = (get_jwt().get("role") or "").lower()
+
+            if allowed and g.role not in allowed:
+                label = "/".join(sorted(allowed)).capitalize()
+                return error_response(f"{label}s only", 403)
+
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_current_role():
+    """
+    Returns the lower-cased role of the current caller.
+    Reuses the token already verified for this request when there is one.
     """
+    role = g.get("role")
+    if role is not None:
+        return role
+    try:
+        claims = get_jwt()
+    except RuntimeError:
+        verify_jwt_in_request()
+        claims = get_jwt()
+    return (claims.get("role") or "").lower()
+
+
+def _current_user_id():
+    user_id = g.get("user_id")
+    if user_id is not None:
+        return user_id
+
     verify_jwt_in_request()
     user_id = get_jwt_identity()
     if user_id is None:
@@ -42,31 +117,28 @@ def get_current_manager_id():
     return int(user_id)
 
 
-# ─────────────────────────────────────────────
-# ADD THESE FUNCTIONS
-# ─────────────────────────────────────────────
+def get_current_manager_id():
+    """
+    Returns the currently logged-in manager's user ID from JWT.
+    Must be called inside a route protected with @role_required() (or @jwt_required()).
+    """
+    return _current_user_id()
+
+
 def get_current_freelancer_id():
     """
     Returns the currently logged-in freelancer's user ID from JWT.
-    Must be called inside a Flask route protected with @jwt_required() or verify_jwt_in_request().
+    Must be called inside a route protected with @role_required() (or @jwt_required()).
     """
-    verify_jwt_in_request()
-    user_id = get_jwt_identity()
-    if user_id is None:
-        raise Exception("JWT identity not found")
-    return int(user_id)
+    return _current_user_id()
 
 
 def get_current_admin_id():
     """
     Returns the currently logged-in admin's user ID from JWT.
-    Must be called inside a Flask route protected with @jwt_required() or verify_jwt_in_request().
+    Must be called inside a route protected with @role_required() (or @jwt_required()).
     """
-    verify_jwt_in_request()
-    user_id = get_jwt_identity()
-    if user_id is None:
-        raise Exception("JWT identity not found")
-    return int(user_id)
+    return _current_user_id()
 
 
 
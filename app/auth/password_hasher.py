@@ -0,0 +1,80 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingUnavailable(Exception):
+    """Raised when the hashing pool is saturated for longer than the allowed wait."""
+
+
+class PasswordHasher:
+    """
+    Password hashing with a configurable Werkzeug method string
+    (e.g. "scrypt", "scrypt:32768:8:1", "pbkdf2:sha256:600000").
+
+    Hashing runs on a small bounded thread pool (hashlib releases the GIL
+    while deriving keys), so a burst of logins can occupy at most
+    PASSWORD_HASH_WORKERS cores and excess requests wait up to
+    PASSWORD_HASH_TIMEOUT seconds for a slot instead of piling up.
+    """
+
+    def __init__(self):
+        self.method = "scrypt"
+        self.workers = 2
+        self.max_pending = 16
+        self.timeout = 10
+        self._executor = None
+        self._slots = None
+        self._policy = None
+        self._policy_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config.get("PASSWORD_HASH_METHOD", self.method)
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS", self.workers)
+        self.max_pending = app.config.get("PASSWORD_HASH_MAX_PENDING", self.max_pending)
+        self.timeout = app.config.get("PASSWORD_HASH_TIMEOUT", self.timeout)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pw-hash")
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+        self._policy = None
+
+    # ---------- Public API ----------
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        if not stored_hash or password is None:
+            return False
+        return self._run(check_password_hash, stored_hash, password)
+
+    def needs_rehash(self, stored_hash):
+        """True when the stored hash was made with a different method/cost than the current policy."""
+        if not stored_hash or "$" not in stored_hash:
+            return True
+        return stored_hash.split("$", 1)[0] != self._current_policy()
+
+    # ---------- Internals ----------
+    def _current_policy(self):
+        # Let Werkzeug fill in its defaults ("scrypt" -> "scrypt:32768:8:1")
+        # so short and fully spelled-out method strings compare equal.
+        if self._policy is None:
+            with self._policy_lock:
+                if self._policy is None:
+                    self._policy = generate_password_hash("", self.method).split("$", 1)[0]
+        return self._policy
+
+    def _run(self, fn, *args):
+        if self._executor is None:
+            return fn(*args)  # not initialised (e.g. outside create_app)
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HashingUnavailable("Password hashing is busy, try again")
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+
+passwords = PasswordHasher()
@@ -0,0 +1,85 @@
+import threading
+import time
+
+# Bump when the shape of the "usr" claim changes; older tokens then fall
+# back to a DB lookup instead of being misread.
+SNAPSHOT_VERSION = 1
+
+
+def build_snapshot(user):
+    """Compact user snapshot embedded in tokens as the "usr" claim."""
+    return {
+        "v": SNAPSHOT_VERSION,
+        "u": user.username,
+        "e": user.email,
+        "sv": user.security_version or 0,
+    }
+
+
+class SecurityVersionCache:
+    """
+    Per-worker TTL cache of users' security versions, so a token's snapshot
+    can be validated without touching the users table on every request.
+    Changes made in this worker are visible immediately; changes made in
+    other workers within SESSION_VERSION_CACHE_TTL seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}  # user_id -> (security_version or None, expires_at)
+        self.ttl = 30
+        self.max_size = 50000
+
+    def init_app(self, app):
+        self.ttl = app.config.get("SESSION_VERSION_CACHE_TTL", self.ttl)
+        self.max_size = app.config.get("SESSION_VERSION_CACHE_SIZE", self.max_size)
+        with self._lock:
+            self._versions.clear()
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._versions.get(user_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        from app.repositories.user_repository import get_security_version
+        version = get_security_version(user_id)
+        with self._lock:
+            if len(self._versions) >= self.max_size:
+                self._versions.clear()
+            self._versions[user_id] = (version, now + self.ttl)
+        return version
+
+    def forget(self, user_id):
+        with self._lock:
+            self._versions.pop(user_id, None)
+
+
+security_versions = SecurityVersionCache()
+
+
+def user_from_claims(claims):
+    """
+    Returns the session user dict from a token's claims when its snapshot is
+    present and still current, otherwise None (caller should hit the DB).
+    """
+    snapshot = claims.get("usr")
+    if not isinstance(snapshot, dict) or snapshot.get("v") != SNAPSHOT_VERSION:
+        return None
+
+    try:
+        user_id = int(claims.get("sub"))
+    except (TypeError, ValueError):
+        return None
+
+    current = security_versions.get(user_id)
+    if current is None or current != snapshot.get("sv"):
+        return None
+
+    return {
+        "id": user_id,
+        "username": snapshot.get("u"),
+        "email": snapshot.get("e"),
+        "role": claims.get("role"),
+    }
@@ -0,0 +1,213 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over revoked JTIs.
+    A negative answer means the JTI was definitely never added.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class TokenBlocklist:
+    """
+    Per-worker revoked-token lookup used by the JWT blocklist loader.
+
+    Lookups go through:
+      1. a TTL'd LRU of known-good / known-revoked JTIs
+      2. an optional Bloom filter of revoked JTIs, synced incrementally
+         from `revoked_tokens` by primary key (first sync on first lookup);
+         each sync also re-reads rows revoked in the last
+         REVOKED_BLOOM_SYNC_OVERLAP_SECONDS, since ids can commit out of order
+      3. the database, only when both layers are inconclusive
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # jti -> (revoked, expires_at)
+        self._bloom = None
+        self._last_synced_id = 0
+        self._synced_at = None
+        self._sync_started = None  # wall-clock start of the last successful sync
+        self.max_size = 10000
+        self.ttl = 30
+        self.bloom_enabled = True
+        self.bloom_capacity = 100000
+        self.sync_interval = 5
+        self.sync_overlap = 60
+        self.reset_stats()
+
+    def init_app(self, app):
+        self.max_size = app.config.get("REVOKED_CACHE_SIZE", self.max_size)
+        self.ttl = app.config.get("REVOKED_CACHE_TTL", self.ttl)
+        self.bloom_enabled = app.config.get("REVOKED_BLOOM_ENABLED", self.bloom_enabled)
+        self.bloom_capacity = app.config.get("REVOKED_BLOOM_CAPACITY", self.bloom_capacity)
+        self.sync_interval = app.config.get("REVOKED_BLOOM_SYNC_SECONDS", self.sync_interval)
+        self.sync_overlap = app.config.get("REVOKED_BLOOM_SYNC_OVERLAP_SECONDS", self.sync_overlap)
+        self.clear()
+        # The first Bloom sync runs lazily on this worker's first is_revoked()
+        # call, so create_app never touches the DB: no errors on a fresh
+        # database, and no connection inherited by preload-forked workers.
+
+    # ---------- Public API ----------
+    def is_revoked(self, jti):
+        if not jti:
+            return True  # invalid token considered revoked
+
+        cached = self._get_cached(jti)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        if self.bloom_enabled:
+            self._maybe_sync_bloom()
+            if self._bloom is not None and jti not in self._bloom:
+                self.bloom_negatives += 1
+                return False
+
+        self.misses += 1
+        from app.repositories.revoked_token_repository import is_token_revoked
+        revoked = is_token_revoked(jti)
+        self._put(jti, revoked)
+        return revoked
+
+    def add(self, jti):
+        """Record a freshly revoked JTI in this worker."""
+        if not jti:
+            return
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+        self._put(jti, True)
+
+    def discard(self, jti):
+        """Forget a JTI (e.g. after its row has been pruned)."""
+        with self._lock:
+            self._entries.pop(jti, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bloom = None
+            self._last_synced_id = 0
+            self._synced_at = None
+            self._sync_started = None
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.bloom_negatives = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.bloom_negatives
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bloom_negatives": self.bloom_negatives,
+            "hit_ratio": round((lookups - self.misses) / lookups, 4) if lookups else 0.0,
+            "cached_entries": len(self._entries),
+            "bloom_entries": self._bloom.count if self._bloom is not None else 0,
+        }
+
+    # ---------- LRU ----------
+    def _get_cached(self, jti):
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is None:
+                return None
+            revoked, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[jti]
+                return None
+            self._entries.move_to_end(jti)
+            return revoked
+
+    def _put(self, jti, revoked):
+        # Revocation is permanent, so only "good" entries need a TTL.
+        expires_at = None if revoked else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[jti] = (revoked, expires_at)
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    # ---------- Bloom sync ----------
+    def _maybe_sync_bloom(self):
+        if self._synced_at is None or time.monotonic() - self._synced_at >= self.sync_interval:
+            self._sync_bloom()
+
+    def _sync_bloom(self):
+        """
+        Pull revocations recorded since the last sync (by any worker).
+        Rows are fetched by primary key, plus a revoked_at window reaching
+        `sync_overlap` seconds before the previous sync: a row whose id is
+        below the high-water mark but committed late is still picked up, as
+        long as it commits within that window.
+        """
+        from app import db
+        from app.repositories.revoked_token_repository import fetch_revoked_since
+
+        started = datetime.now(timezone.utc)
+        since = None
+        if self._sync_started is not None:
+            since = self._sync_started - timedelta(seconds=self.sync_overlap)
+
+        try:
+            rows = fetch_revoked_since(self._last_synced_id, since)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print("Blocklist sync failed:", repr(e))
+            return
+
+        with self._lock:
+            if self._bloom is None:
+                self._bloom = BloomFilter(self.bloom_capacity)
+            for row_id, jti in rows:
+                if jti not in self._bloom:  # overlap rows are mostly known already
+                    self._bloom.add(jti)
+                if jti in self._entries:
+                    self._entries[jti] = (True, None)
+                self._last_synced_id = max(self._last_synced_id, row_id)
+
+            # Past capacity the false-positive rate climbs; grow and resync.
+            if self._bloom.count > self._bloom.capacity:
+                self.bloom_capacity = self._bloom.capacity * 2
+                self._bloom = None
+                self._last_synced_id = 0
+                self._synced_at = None
+                self._sync_started = None
+                return
+
+            self._synced_at = time.monotonic()
+            self._sync_started = started
+
+
+blocklist = TokenBlocklist()
@@ -0,0 +1,82 @@
+import click
+from flask import current_app
+
+
+def register_commands(app):
+    @app.cli.command("prune-tokens")
+    @click.option("--chunk-size", type=int, default=None, help="Rows deleted per transaction.")
+    def prune_tokens_command(chunk_size):
+        """Delete expired revoked tokens and password-reset OTPs."""
+        from app.services.token_cleanup_service import prune_expired_tokens
+
+        result = prune_expired_tokens(chunk_size or current_app.config["TOKEN_PRUNE_CHUNK_SIZE"])
+        click.echo(
+            f"Pruned {result['revoked_tokens']} revoked tokens, "
+            f"{result['password_reset_otps']} password reset OTPs"
+        )
+
+    @app.cli.command("backfill-batch-members")
+    @click.option("--chunk-size", type=int, default=500, help="BatchMember rows processed per transaction.")
+    def backfill_batch_members_command(chunk_size):
+        """Copy legacy BatchMember.team_members blobs into batch_member_assignments."""
+        from app.repositories.batch_repository import backfill_batch_member_assignments
+
+        touched = backfill_batch_member_assignments(chunk_size)
+        click.echo(f"Backfilled {touched} batch member assignments")
+
+    @app.cli.command("recount-batch-totals")
+    def recount_batch_totals_command():
+        """Rebuild batches.assigned_total from the tasks table."""
+        from app.repositories.batch_repository import recount_batch_assigned_totals
+
+        updated = recount_batch_assigned_totals()
+        click.echo(f"Recounted assigned_total for {updated} batches")
+
+    @app.cli.command("backfill-job-files")
+    @click.option("--chunk-size", type=int, default=100, help="Jobs updated per transaction.")
+    def backfill_job_files_command(chunk_size):
+        """Compute size and SHA-256 for job description files stored before those columns existed."""
+        from app.repositories.job_repository import backfill_job_attachment_meta
+
+        updated = backfill_job_attachment_meta(chunk_size)
+        click.echo(f"Backfilled file metadata for {updated} jobs")
+
+    @app.cli.command("backfill-skills")
+    @click.option("--chunk-size", type=int, default=500, help="Rows linked per transaction.")
+    def backfill_skills_command(chunk_size):
+        """Link profiles, jobs and batches to the skills table from their CSV columns."""
+        from app.repositories.skill_repository import backfill_skill_links
+
+        counts = backfill_skill_links(chunk_size)
+        click.echo(
+            f"Linked skills for {counts['profiles']} profiles, "
+            f"{counts['jobs']} jobs, {counts['batches']} batches"
+        )
+
+    @app.cli.command("prune-attachments")
+    @click.option("--min-age", type=int, default=3600, help="Only remove files untouched for this many seconds.")
+    def prune_attachments_command(min_age):
+        """Delete stored attachment files no job attachment references any more."""
+        from app.services.attachment_store import attachment_store
+        from app.repositories.attachment_repository import referenced_hashes
+
+        removed = attachment_store.prune(referenced_hashes, min_age)
+        click.echo(f"Removed {removed} unreferenced attachment files")
+
+    @app.cli.command("rebuild-search-index")
+    def rebuild_search_index_command():
+        """Create / refill the SQLite FTS5 search tables (no-op on PostgreSQL)."""
+        from app.repositories.search_repository import rebuild_search_index
+
+        rebuilt = rebuild_search_index()
+        click.echo(f"Rebuilt {', '.join(rebuilt)}" if rebuilt else "Nothing to rebuild on this database")
+
+    @app.cli.command("add-skill-alias")
+    @click.argument("alias")
+    @click.argument("canonical")
+    def add_skill_alias_command(alias, canonical):
+        """Make ALIAS resolve to the CANONICAL skill (merging ALIAS if it already exists)."""
+        from app.repositories.skill_repository import add_skill_alias
+
+        skill = add_skill_alias(alias, canonical)
+        click.echo(f"'{alias}' now resolves to '{skill.name}' (id {skill.id})")
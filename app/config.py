@@ -14,6 +14,54 @@ class Config:
     JWT_COOKIE_CSRF_PROTECT = True
     JWT_ACCESS_CSRF_HEADER_NAME = "X-CSRF-TOKEN"
 
+    # Password hashing (Werkzeug method string, e.g. "scrypt" or "pbkdf2:sha256:600000")
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))  # concurrent hashes per worker process
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 16))
+    PASSWORD_HASH_TIMEOUT = int(os.getenv("PASSWORD_HASH_TIMEOUT", 10))  # seconds to wait for a free slot
+
+    # Revoked-token cache (per worker)
+    REVOKED_CACHE_SIZE = int(os.getenv("REVOKED_CACHE_SIZE", 10000))
+    REVOKED_CACHE_TTL = int(os.getenv("REVOKED_CACHE_TTL", 30))  # seconds a "not revoked" answer is trusted
+    REVOKED_BLOOM_ENABLED = os.getenv("REVOKED_BLOOM_ENABLED", "true").lower() == "true"
+    REVOKED_BLOOM_CAPACITY = int(os.getenv("REVOKED_BLOOM_CAPACITY", 100000))
+    REVOKED_BLOOM_SYNC_SECONDS = int(os.getenv("REVOKED_BLOOM_SYNC_SECONDS", 5))
+    REVOKED_BLOOM_SYNC_OVERLAP_SECONDS = int(os.getenv("REVOKED_BLOOM_SYNC_OVERLAP_SECONDS", 60))  # re-read window for late commits
+
+    # Session snapshot validation (per worker)
+    SESSION_VERSION_CACHE_TTL = int(os.getenv("SESSION_VERSION_CACHE_TTL", 30))
+    SESSION_VERSION_CACHE_SIZE = int(os.getenv("SESSION_VERSION_CACHE_SIZE", 50000))
+
+    # Keyset pagination of list endpoints
+    PAGE_SIZE = int(os.getenv("PAGE_SIZE", 50))
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 200))
+
+    # Batch recommendations (weights of the score components, summing to 1)
+    RECOMMEND_PAGE_SIZE = int(os.getenv("RECOMMEND_PAGE_SIZE", 20))
+    RECOMMEND_MAX_PAGE_SIZE = int(os.getenv("RECOMMEND_MAX_PAGE_SIZE", 100))
+    RECOMMEND_WEIGHT_SKILLS = float(os.getenv("RECOMMEND_WEIGHT_SKILLS", 0.55))
+    RECOMMEND_WEIGHT_CAPACITY = float(os.getenv("RECOMMEND_WEIGHT_CAPACITY", 0.2))
+    RECOMMEND_WEIGHT_DEADLINE = float(os.getenv("RECOMMEND_WEIGHT_DEADLINE", 0.15))
+    RECOMMEND_WEIGHT_EXPERIENCE = float(os.getenv("RECOMMEND_WEIGHT_EXPERIENCE", 0.1))
+    RECOMMEND_DEADLINE_HORIZON_DAYS = float(os.getenv("RECOMMEND_DEADLINE_HORIZON_DAYS", 14))
+
+    # Per-freelancer suggestion cache (per worker)
+    SUGGESTION_CACHE_SIZE = int(os.getenv("SUGGESTION_CACHE_SIZE", 5000))  # freelancers
+    SUGGESTION_CACHE_MAX_ITEMS = int(os.getenv("SUGGESTION_CACHE_MAX_ITEMS", 2000000))  # cached candidates in total
+    SUGGESTION_CACHE_TTL = int(os.getenv("SUGGESTION_CACHE_TTL", 300))
+
+    # Job attachments (content-addressed store on disk)
+    ATTACHMENT_DIR = os.getenv("ATTACHMENT_DIR", "attachments")  # relative paths resolve under the instance folder
+    ATTACHMENT_CHUNK_SIZE = int(os.getenv("ATTACHMENT_CHUNK_SIZE", 1024 * 1024))  # bytes copied per read while storing
+    USE_X_SENDFILE = os.getenv("USE_X_SENDFILE", "false").lower() == "true"  # let the front proxy serve downloads
+
+    # Admin dashboard counters (per worker)
+    ADMIN_STATS_TTL = int(os.getenv("ADMIN_STATS_TTL", 30))
+
+    # Expired revoked-token / OTP pruning
+    TOKEN_PRUNE_INTERVAL_SECONDS = int(os.getenv("TOKEN_PRUNE_INTERVAL_SECONDS", 0))  # 0 = in-process scheduler off
+    TOKEN_PRUNE_CHUNK_SIZE = int(os.getenv("TOKEN_PRUNE_CHUNK_SIZE", 1000))
+
     if ENV == "development":
         JWT_COOKIE_SECURE = False
         JWT_COOKIE_SAMESITE = "Lax"
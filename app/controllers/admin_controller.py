@@ -1,40 +1,44 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services.admin_service import (
     get_admin_stats,
     create_project,
     list_projects,
+    get_project,
     update_project,
     delete_project,
     assign_manager_to_jobs,
-    close_project
+    close_project,
+    add_project_attachments,
+    list_project_attachments,
+    remove_project_attachment
 )
-from app.utils.response import error_response
+from app.auth.auth_utils import role_required, get_current_admin_id
+from app.utils.response import error_response, list_response
+from app.utils.pagination import page_args
+from app.utils.skills import clean_skills_input
+from app.auth.token_blocklist import blocklist
+from app.services.suggestion_cache import suggestion_cache
 
 bp = Blueprint("admin", __name__, url_prefix="/admin")
 
-UPLOAD_FOLDER = "uploads"
-
 # ------------------- PROJECTS -------------------
 
 @bp.route("/projects", methods=["POST"])
-@jwt_required()
+@role_required("admin")
 def create_project_route():
     """Admin-only route to create a new project (super clean & simple)."""
-    claims = get_jwt()
-    if claims.get("role") != "admin":
-        return error_response("Admins only", 403)
-
     try:
         # Support both FormData and JSON
         if request.content_type and "multipart/form-data" in request.content_type:
             data = request.form.to_dict()
+            file = request.files.get("description_file")
+            if file and file.filename:
+                data["description_file"] = file
         else:
             data = request.get_json(silent=True) or {}
 
         # ✅ Clean & format required_skills
-        skills_raw = data.get("required_skills", "")
-        cleaned_skills = ", ".join([s.strip() for s in skills_raw.split(",") if s.strip()])
+        cleaned_skills = ", ".join(clean_skills_input(data.get("required_skills")))
         data["required_skills"] = cleaned_skills  # store as plain comma string
 
         # ✅ Validation
@@ -46,7 +50,7 @@ def create_project_route():
         data["description"] = data.get("description", "")
 
         # ✅ Create project
-        project = create_project(get_jwt_identity(), data)
+        project = create_project(get_current_admin_id(), data)
 
         return jsonify({
             "message": "Project created successfully",
@@ -83,48 +87,42 @@ def create_project_route():
 
 
 @bp.route("/projects", methods=["GET"])
-@jwt_required()
+@role_required("admin")
 def list_projects_route():
     """Admin-only route to list all projects."""
-    claims = get_jwt()
-    if claims.get("role") != "admin":
-        return error_response("Admins only", 403)
-
     try:
-        projects = list_projects()
-        return jsonify(projects), 200
+        projects, next_cursor = list_projects(*page_args())
+        return list_response(projects, next_cursor)
     except Exception as e:
         print("Project listing error:", e)
         return error_response(str(e), 400)
 
 
 @bp.route("/projects/<int:project_id>", methods=["GET"])
-@jwt_required()
+@role_required("admin")
 def get_project_route(project_id):
-    """Get a single project by ID"""
-    claims = get_jwt()
-    if claims.get("role") != "admin":
-        return error_response("Admins only", 403)
-    
+    """Get a single project by ID (?summary=1 adds batch/task/team counts)"""
     try:
-        projects = list_projects()  # returns a list of dicts
-        project = next((p for p in projects if p["id"] == project_id), None)
+        include_summary = request.args.get("summary", "").lower() in ("1", "true")
+        project, etag = get_project(project_id, include_summary)
         if not project:
             return error_response("Project not found", 404)
-        return jsonify(project), 200
+
+        # Conditional GET: 304 when the client's If-None-Match still matches
+        response = jsonify(project)
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as e:
         print("Get project error:", e)
         return error_response(str(e), 400)
 
 
 @bp.route("/projects/<int:project_id>", methods=["PUT"])
-@jwt_required()
+@role_required("admin")
 def update_project_route(project_id):
     """Admin-only route to update an existing project (supports optional file upload)."""
-    claims = get_jwt()
-    if claims.get("role") != "admin":
-        return error_response("Admins only", 403)
-
     data = {}
     description_file = None
 
@@ -134,18 +132,14 @@ def update_project_route(project_id):
             data = request.form.to_dict()
             file = request.files.get("description_file")
             if file and file.filename:
-                os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-                filename = secure_filename(file.filename)
-                file_path = os.path.join(UPLOAD_FOLDER, filename)
-                file.save(file_path)
-                data["description_file"] = file_path
+                data["description_file"] = file
         else:
             data = request.get_json() or {}
 
         if not data:
             return error_response("Missing data", 400)
 
-        project = update_project(project_id, data)
+        project = update_project(project_id, data, request.files.getlist("files"), get_current_admin_id())
         return jsonify({
             "success": True,
             "message": "Project updated successfully",
@@ -158,14 +152,42 @@ def update_project_route(project_id):
 
 
 
+# ------------------- ATTACHMENTS -------------------
+
+@bp.route("/projects/<int:project_id>/attachments", methods=["POST"])
+@role_required("admin")
+def upload_attachments_route(project_id):
+    """Admin-only: attach one or more files (multipart field "files") to a project."""
+    uploads = request.files.getlist("files")
+    if not any(f.filename for f in uploads):
+        return error_response("No files uploaded", 400)
+    try:
+        attachments = add_project_attachments(project_id, uploads, get_current_admin_id())
+        return jsonify(attachments), 201
+    except LookupError as e:
+        return error_response(str(e), 404)
+
+
+@bp.route("/projects/<int:project_id>/attachments", methods=["GET"])
+@role_required("admin")
+def list_attachments_route(project_id):
+    return jsonify(list_project_attachments(project_id)), 200
+
+
+@bp.route("/projects/<int:project_id>/attachments/<int:attachment_id>", methods=["DELETE"])
+@role_required("admin")
+def delete_attachment_route(project_id, attachment_id):
+    try:
+        remove_project_attachment(project_id, attachment_id)
+        return jsonify({"message": "Attachment deleted successfully"}), 200
+    except LookupError as e:
+        return error_response(str(e), 404)
+
+
 @bp.route("/projects/<int:project_id>", methods=["DELETE"])
-@jwt_required()
+@role_required("admin")
 def delete_project_route(project_id):
     """Admin-only route to delete a project."""
-    claims = get_jwt()
-    if claims.get("role") != "admin":
-        return error_response("Admins only", 403)
-
     try:
         delete_project(project_id)
         return jsonify({"message": "Project deleted successfully"}), 200
@@ -175,13 +197,9 @@ def delete_project_route(project_id):
 
 
 @bp.route("/assign-manager", methods=["POST"])
-@jwt_required()
+@role_required("admin")
 def assign_manager_route():
     """Admin-only route to assign a manager to multiple jobs."""
-    claims = get_jwt()
-    if claims.get("role") != "admin":
-        return error_response("Admins only", 403)
-
     data = request.get_json()
     if not data:
         return error_response("Missing JSON body", 400)
@@ -203,13 +221,9 @@ def assign_manager_route():
 
 
 @bp.route("/projects/<int:project_id>/close", methods=["PUT"])
-@jwt_required()
+@role_required("admin")
 def close_project_route(project_id):
     """Admin-only route to close project."""
-    claims = get_jwt()
-    if claims.get("role") != "admin":
-        return error_response("Admins only", 403)
-
     try:
         project = close_project(project_id)
         return jsonify({"message": "Project closed", "project_id": project.id}), 200
@@ -220,12 +234,18 @@ def close_project_route(project_id):
 
 # ------------------- ADMIN STATS -------------------
 @bp.route("/stats", methods=["GET"])
-@jwt_required()
+@role_required("admin")
 def stats():
     """Admin-only route to get system stats."""
-    claims = get_jwt()
-    if claims.get("role", "").lower() != "admin":
-        return error_response("Unauthorized", 403)
-
     stats_data = get_admin_stats()
     return jsonify(stats_data), 200
+
+
+@bp.route("/cache-stats", methods=["GET"])
+@role_required("admin")
+def cache_stats():
+    """Admin-only route to get this worker's in-process cache metrics."""
+    return jsonify({
+        "revoked_tokens": blocklist.stats(),
+        "suggestions": suggestion_cache.stats(),
+    }), 200
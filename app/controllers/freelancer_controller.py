@@ -1,5 +1,5 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import get_jwt_identity
 from app.services.freelancer_service import (
     create_freelancer_profile,
     get_freelancer_profile,
@@ -15,8 +15,9 @@ from app.services.onboarding_service import (
     get_freelancer_onboarding_steps,
     update_onboarding_status_by_freelancer
 )
-from app.repositories.user_repository import is_freelancer_request
-from app.utils.response import error_response, success_response
+from app.auth.auth_utils import role_required, get_current_freelancer_id
+from app.utils.response import error_response, success_response, list_response
+from app.utils.pagination import page_args
 from app.services import task_service
 
 bp = Blueprint('freelancer', __name__, url_prefix='/freelancer')
@@ -24,12 +25,9 @@ bp = Blueprint('freelancer', __name__, url_prefix='/freelancer')
 
 # ---------- Profile ----------
 @bp.route('/profile', methods=['GET'])
-@jwt_required()
+@role_required("freelancer")
 def get_profile():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    user_id = get_jwt_identity()
+    user_id = get_current_freelancer_id()
     profile = get_freelancer_profile(user_id)
 
     if profile is None:
@@ -58,12 +56,9 @@ def get_profile():
 
 
 @bp.route('/create_profile', methods=['POST'])
-@jwt_required()
+@role_required("freelancer")
 def create_profile():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    user_id = get_jwt_identity()
+    user_id = get_current_freelancer_id()
     data = request.get_json() or {}
     success, error = create_freelancer_profile(user_id, data)
     if error:
@@ -72,12 +67,9 @@ def create_profile():
 
 
 @bp.route('/profile', methods=['PUT'])
-@jwt_required()
+@role_required("freelancer")
 def update_profile():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    user_id = get_jwt_identity()
+    user_id = get_current_freelancer_id()
     data = request.get_json() or {}
     success, error = update_freelancer_profile(user_id, data)
     if not success:
@@ -87,23 +79,20 @@ def update_profile():
 
 # ---------- Jobs ----------
 @bp.route('/jobs', methods=['GET'])
-@jwt_required()
+@role_required("freelancer")
 def list_jobs():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    jobs = get_active_jobs()
-    return jsonify(jobs), 200
+    try:
+        jobs, next_cursor = get_active_jobs(*page_args())
+    except ValueError as e:
+        return error_response(str(e), 400)
+    return list_response(jobs, next_cursor)
 
 
 # ---------- Applications ----------
 @bp.route('/applications/batch', methods=['POST'])
-@jwt_required()
+@role_required("freelancer")
 def apply_batch():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    user_id = get_jwt_identity()
+    user_id = get_current_freelancer_id()
     data = request.get_json() or {}
     batch_id = data.get("batch_id")
 
@@ -118,35 +107,26 @@ def apply_batch():
 
 
 @bp.route('/applications/mine', methods=['GET'])
-@jwt_required()
+@role_required("freelancer")
 def my_applications():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    user_id = get_jwt_identity()
+    user_id = get_current_freelancer_id()
     apps = list_my_applications(user_id)
     return jsonify(apps), 200
 
 
 # ---------- Onboarding ----------
 @bp.route('/onboarding', methods=['GET'])
-@jwt_required()
+@role_required("freelancer")
 def view_onboarding():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    freelancer_id = get_jwt_identity()
+    freelancer_id = get_current_freelancer_id()
     steps = get_freelancer_onboarding_steps(freelancer_id)
     return success_response("Your onboarding steps", steps)
 
 
 @bp.route('/onboarding/update-status', methods=['PATCH'])
-@jwt_required()
+@role_required("freelancer")
 def update_onboarding_status():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    freelancer_id = get_jwt_identity()
+    freelancer_id = get_current_freelancer_id()
     data = request.get_json() or {}
     data["freelancer_id"] = freelancer_id
 
@@ -157,12 +137,9 @@ def update_onboarding_status():
 # ---------- Tasks ----------
 # ---------- Tasks ----------
 @bp.route('/tasks', methods=['GET'])
-@jwt_required()
+@role_required("freelancer")
 def my_tasks():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    user_id = get_jwt_identity()  # JWT identity = user ID
+    user_id = get_current_freelancer_id()  # JWT identity = user ID
     try:
         tasks = task_service.fetch_user_tasks(user_id)
         # include freelancer info
@@ -173,11 +150,8 @@ def my_tasks():
     
 
 @bp.route("/tasks/status", methods=["PATCH"])
-@jwt_required()
+@role_required("freelancer")
 def update_task_status_freelancer():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
     username = get_jwt_identity()
     data = request.get_json() or {}
     task_id = data.get("task_id")
@@ -201,12 +175,9 @@ def update_task_status_freelancer():
 
 # ---------- Task by ID ----------
 @bp.route('/tasks/<int:task_id>', methods=['GET'])
-@jwt_required()
+@role_required("freelancer")
 def get_task_details(task_id):
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    # user_id = get_jwt_identity()
+    # user_id = get_current_freelancer_id()
     task = task_service.get_task_by_id(task_id)
     print("Task : ",task)
 
@@ -222,12 +193,9 @@ def get_task_details(task_id):
 
 
 @bp.route('/tasks/<int:task_id>', methods=['PATCH'])
-@jwt_required()
+@role_required("freelancer")
 def update_task_details(task_id):
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    # user_id = get_jwt_identity()
+    # user_id = get_current_freelancer_id()
     task = task_service.get_task_by_id(task_id)
 
     if not task:
@@ -252,23 +220,25 @@ def update_task_details(task_id):
 
 # ---------- Suggested Batches ----------
 @bp.route('/batches', methods=['GET'])
-@jwt_required()
+@role_required("freelancer")
 def list_available_batches():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
+    user_id = get_current_freelancer_id()
+    config = current_app.config
+    limit, cursor = page_args(config["RECOMMEND_PAGE_SIZE"], config["RECOMMEND_MAX_PAGE_SIZE"])
 
-    user_id = get_jwt_identity()
-    batches = get_suggested_batches(user_id)
-    return jsonify(batches), 200
+    try:
+        batches, next_cursor = get_suggested_batches(user_id, limit, cursor)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    # Body stays a plain list for existing clients; the next page is advertised in a header
+    return list_response(batches, next_cursor)
 
 
 @bp.route('/batches/mine', methods=['GET'])
-@jwt_required()
+@role_required("freelancer")
 def my_batches():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
-    freelancer_id = get_jwt_identity()
+    freelancer_id = get_current_freelancer_id()
     batches = get_my_batches(freelancer_id)
     return success_response("Batches you are part of", batches)
 
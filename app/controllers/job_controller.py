@@ -1,16 +1,107 @@
 # app/controllers/job_controller.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.datastructures import ContentRange
 from app.services.job_service import create_job, list_all_jobs
 from app.services.job_service import (
     create_job,
     list_all_jobs,
-    list_open_jobs  
+    list_open_jobs,
+    get_description_file_meta,
+    iter_description_file,
+    list_job_files,
+    get_job_file
 )
+from app.auth.auth_utils import role_required, get_current_role
+from app.utils.response import error_response
 
 
 bp = Blueprint('job_controller', __name__, url_prefix='/job')
 
+
+# ---------- Description file download ----------
+@bp.route('/<int:job_id>/description-file', methods=['GET'])
+@role_required()
+def download_description_file(job_id):
+    try:
+        meta = get_description_file_meta(job_id, get_jwt_identity(), get_current_role())
+    except LookupError as e:
+        return error_response(str(e), 404)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+
+    size = meta.description_file_size
+    etag = meta.description_file_sha256
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    # Single byte range (honouring If-Range); anything else gets the whole file
+    start, stop, status = 0, size, 200
+    byte_range = request.range
+    if_range = request.if_range
+    range_valid = not (if_range.etag or if_range.date) or if_range.etag == etag
+    if byte_range is not None and len(byte_range.ranges) == 1 and range_valid:
+        bounds = byte_range.range_for_length(size)
+        if bounds is None:
+            response = error_response("Requested range not satisfiable", 416)[0]
+            response.status_code = 416
+            response.headers["Content-Range"] = f"bytes */{size}"
+            return response
+        start, stop = bounds
+        status = 206
+
+    response = Response(
+        stream_with_context(iter_description_file(job_id, start, stop)),
+        status=status,
+        mimetype=meta.description_file_type or "application/octet-stream",
+    )
+    response.headers["Content-Length"] = str(stop - start)
+    response.headers["Accept-Ranges"] = "bytes"
+    response.headers.set("Content-Disposition", "attachment", filename=meta.description_file_name or f"job-{job_id}")
+    response.set_etag(etag)
+    if status == 206:
+        response.content_range = ContentRange("bytes", start, stop, size)
+    return response
+
+
+# ---------- Attachments ----------
+@bp.route('/<int:job_id>/attachments', methods=['GET'])
+@role_required()
+def list_attachments(job_id):
+    try:
+        return jsonify(list_job_files(job_id, get_jwt_identity(), get_current_role())), 200
+    except LookupError as e:
+        return error_response(str(e), 404)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+
+
+@bp.route('/<int:job_id>/attachments/<int:attachment_id>', methods=['GET'])
+@role_required()
+def download_attachment(job_id, attachment_id):
+    try:
+        attachment, path = get_job_file(job_id, attachment_id, get_jwt_identity(), get_current_role())
+    except LookupError as e:
+        return error_response(str(e), 404)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+
+    # send_file streams from disk (wsgi.file_wrapper / X-Sendfile) and handles Range + If-None-Match
+    response = send_file(
+        path,
+        mimetype=attachment.content_type or "application/octet-stream",
+        as_attachment=True,
+        download_name=attachment.filename,
+        conditional=True,
+        etag=attachment.sha256,
+    )
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
 # @bp.route('/post_job', methods=['POST'])
 # @jwt_required()
 # def post_job():
@@ -1,17 +1,13 @@
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, verify_jwt_in_request
 from app.services import job_invoice_service
-from app.repositories.user_repository import (
-    is_manager_request,
-    is_admin_request,
-    is_freelancer_request,
-)
 from app.auth.auth_utils import (
+    role_required,
     get_current_manager_id,
     get_current_freelancer_id,
     get_current_admin_id,
 )
 from app.utils.response import success_response, error_response
+from app.utils.pagination import page_args
 
 
 # ─────────────────────────────────────────────
@@ -28,26 +24,12 @@ admin_invoice_bp = Blueprint(
 )
 
 
-# ─────────────────────────────────────────────
-# JWT SECURITY WRAPPER
-# ─────────────────────────────────────────────
-def secure_jwt_required(fn):
-    def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        return fn(*args, **kwargs)
-    wrapper.__name__ = fn.__name__
-    return jwt_required()(wrapper)
-
-
 # ─────────────────────────────────────────────
 # FREELANCER ROUTES
 # ─────────────────────────────────────────────
 @freelancer_invoice_bp.route("/create", methods=["POST"])
-@secure_jwt_required
+@role_required("freelancer")
 def freelancer_create_invoice():
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
     try:
         data = request.get_json(silent=True)
         freelancer_id = get_current_freelancer_id()
@@ -64,12 +46,9 @@ def freelancer_create_invoice():
 
 
 @freelancer_invoice_bp.route("/my", methods=["GET"])
-@secure_jwt_required
+@role_required("freelancer")
 def freelancer_my_invoices():
     """Freelancer views all their own invoices."""
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
     try:
         freelancer_id = get_current_freelancer_id()
         invoices = job_invoice_service.get_invoices_for_freelancer(freelancer_id)
@@ -84,12 +63,9 @@ def freelancer_my_invoices():
 # FREELANCER WORK SUMMARY (auto user ID)
 # ─────────────────────────────────────────────
 @freelancer_invoice_bp.route("/work_summary", methods=["GET"])
-@secure_jwt_required
+@role_required("freelancer")
 def get_my_work_summary():
     """Freelancer fetches their own completed work summary."""
-    if not is_freelancer_request():
-        return error_response("Freelancers only", 403)
-
     try:
         freelancer_id = get_current_freelancer_id()
         print(f"🟢 Fetching work summary for freelancer_id={freelancer_id}")
@@ -107,28 +83,24 @@ def get_my_work_summary():
 # MANAGER ROUTES
 # ─────────────────────────────────────────────
 @manager_invoice_bp.route("/all", methods=["GET"])
-@secure_jwt_required
+@role_required("manager")
 def manager_all_invoices():
     """Manager views all invoices under their freelancers."""
-    if not is_manager_request():
-        return error_response("Managers only", 403)
-
     try:
         manager_id = get_current_manager_id()
-        invoices = job_invoice_service.list_invoices(manager_id)
-        return success_response("Invoices fetched successfully", invoices)
+        invoices, next_cursor = job_invoice_service.list_invoices(manager_id, *page_args())
+        return success_response("Invoices fetched successfully", invoices, next_cursor=next_cursor)
+    except ValueError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         print("❌ Manager list invoices error:", repr(e))
         return error_response("Internal server error", 500)
 
 
 @manager_invoice_bp.route("/<string:invoice_id>", methods=["GET"])
-@secure_jwt_required
+@role_required("manager")
 def manager_get_invoice(invoice_id):
     """Manager fetches a specific invoice by ID."""
-    if not is_manager_request():
-        return error_response("Managers only", 403)
-
     try:
         manager_id = get_current_manager_id()
 
@@ -144,12 +116,9 @@ def manager_get_invoice(invoice_id):
 
 
 @manager_invoice_bp.route("/<string:invoice_id>/status", methods=["PUT"])
-@secure_jwt_required
+@role_required("manager")
 def manager_update_invoice_status(invoice_id):
     """Manager approves or rejects an invoice."""
-    if not is_manager_request():
-        return error_response("Managers only", 403)
-
     try:
         data = request.get_json(silent=True)
         # Handle case where data is a string instead of dict
@@ -175,15 +144,14 @@ def manager_update_invoice_status(invoice_id):
 # ADMIN ROUTES
 # ─────────────────────────────────────────────
 @admin_invoice_bp.route("/all", methods=["GET"])
-@secure_jwt_required
+@role_required("admin")
 def admin_all_invoices():
     """Admin can view all invoices in the system."""
-    if not is_admin_request():
-        return error_response("Admins only", 403)
-
     try:
-        invoices = job_invoice_service.list_all_invoices()
-        return success_response("All invoices fetched successfully", invoices)
+        invoices, next_cursor = job_invoice_service.list_all_invoices(*page_args())
+        return success_response("All invoices fetched successfully", invoices, next_cursor=next_cursor)
+    except ValueError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         print("❌ Admin list invoices error:", repr(e))
         return error_response("Internal server error", 500)
@@ -1,10 +1,10 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 
 from app.services.manager_service import (
     get_manager_dashboard_data,
     get_manager_jobs,
     get_manager_tasks,
+    get_full_project as load_full_project,
     add_batch,
     get_batch_applications,
     change_application_status,
@@ -13,62 +13,36 @@ from app.services.manager_service import (
     edit_batch
 )
 
-from app.repositories.user_repository import is_manager_request
-from app.repositories.batch_repository import get_batches_by_manager, get_batch_members, assign_freelancers_to_batch
-from app.repositories.task_repository import create_task
-from app.auth.auth_utils import get_current_manager_id
+from app.repositories.batch_repository import (
+    get_batches_by_manager,
+    get_batch_members,
+    assign_freelancers_to_batch
+)
+from app.repositories.task_repository import create_task, create_tasks_bulk, BulkTaskError
+from app.auth.auth_utils import role_required, get_current_manager_id
 from app.utils.response import success_response, error_response
+from app.utils.pagination import page_args
 
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import joinedload
 
 from app import db
 from app.models.user import User
-from app.models.BatchMember import BatchMember
-from app.models.job import Job
-from app.models.batch import Batch
 from app.models.task import Task
 
-import json
-from app.services.task_service import edit_task
+from app.services.task_service import edit_task, distribute_batch
 
 
 bp = Blueprint("manager", __name__, url_prefix="/manager")
 
 
-# -----------------------------------------------------
-#                  SECURITY WRAPPER
-# -----------------------------------------------------
-def secure_jwt_required(fn):
-    def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        return fn(*args, **kwargs)
-    wrapper.__name__ = fn.__name__
-    return jwt_required()(wrapper)
-
-
-def require_manager():
-    return is_manager_request()
-
-
-def manager_id():
-    identity = get_jwt_identity()
-    try:
-        return int(identity)
-    except Exception:
-        return identity
-
-
 # -----------------------------------------------------
 #                 DASHBOARD
 # -----------------------------------------------------
 @bp.route("/dashboard", methods=["GET"])
-@secure_jwt_required
+@role_required("manager")
 def dashboard():
-    if not require_manager():
-        return error_response("Managers only", 403)
     try:
-        data = get_manager_dashboard_data(manager_id())
+        data = get_manager_dashboard_data(get_current_manager_id())
         return success_response("Dashboard fetched", data)
     except Exception as e:
         print("Dashboard error:", e)
@@ -79,17 +53,14 @@ def dashboard():
 #           MANAGER PROFILE (GET + UPDATE)
 # -----------------------------------------------------
 @bp.route("/profile", methods=["GET"])
-@secure_jwt_required
+@role_required("manager")
 def get_manager_profile_route():
-    if not require_manager():
-        return error_response("Managers only", 403)
-
     from app.repositories.manager_repository import (
         get_manager_profile,
         create_empty_manager_profile
     )
 
-    user_id = manager_id()
+    user_id = get_current_manager_id()
     profile = get_manager_profile(user_id)
 
     if not profile:
@@ -100,13 +71,10 @@ def get_manager_profile_route():
 
 
 @bp.route("/profile", methods=["PUT"])
-@secure_jwt_required
+@role_required("manager")
 def update_manager_profile_route():
-    if not require_manager():
-        return error_response("Managers only", 403)
-
     data = request.get_json() or {}
-    user_id = manager_id()
+    user_id = get_current_manager_id()
 
     from app.repositories.manager_repository import update_manager_profile
     updated = update_manager_profile(user_id, data)
@@ -119,12 +87,10 @@ def update_manager_profile_route():
 #                     PROJECTS
 # -----------------------------------------------------
 @bp.route("/projects", methods=["GET"])
-@secure_jwt_required
+@role_required("manager")
 def projects():
-    if not require_manager():
-        return error_response("Managers only", 403)
     try:
-        data = get_manager_jobs(manager_id())
+        data = get_manager_jobs(get_current_manager_id())
         return success_response("Projects fetched", data)
     except Exception as e:
         print("Projects error:", e)
@@ -135,60 +101,13 @@ def projects():
 #               SINGLE PROJECT WITH BATCHES
 # -----------------------------------------------------
 @bp.route("/projects/<int:project_id>", methods=["GET"])
-@secure_jwt_required
+@role_required("manager")
 def get_full_project(project_id):
-    if not require_manager():
-        return error_response("Managers only", 403)
-
     try:
-        mid = manager_id()
-
-        project = (
-            db.session.query(Job)
-            .filter_by(id=project_id, manager_id=mid)
-            .options(joinedload(Job.batches).joinedload(Batch.tasks))
-            .first()
-        )
-
-        if not project:
+        result = load_full_project(get_current_manager_id(), project_id)
+        if not result:
             return error_response("Project not found", 404)
 
-        batch_ids = [b.id for b in project.batches]
-        batch_member_rows = BatchMember.query.filter(
-            BatchMember.batch_id.in_(batch_ids)
-        ).all()
-
-        batch_members_map = {}
-
-        for bm in batch_member_rows:
-            members = []
-            if bm.team_members:
-                try:
-                    members = json.loads(bm.team_members)
-                except:
-                    names = [x.strip() for x in bm.team_members.split(",")]
-                    members = [{"id": 0, "username": n} for n in names]
-            batch_members_map[bm.batch_id] = members
-
-        result = {
-            "project": {
-                "job_id": project.id,
-                "title": project.title,
-                "description": project.description,
-                "status": project.status,
-                "skills_required": project.skills_required,
-                "project_type": project.project_type,
-                "created_at": project.created_at.isoformat(),
-            },
-            "batches": [],
-        }
-
-        for batch in project.batches:
-            bdata = batch.to_dict(include_tasks=True)
-            bdata["team_members"] = batch_members_map.get(batch.id, [])
-            bdata["tasks"] = [t.to_dict(include_freelancer=True) for t in batch.tasks]
-            result["batches"].append(bdata)
-
         return success_response("Project loaded", result)
 
     except Exception as e:
@@ -200,11 +119,8 @@ def get_full_project(project_id):
 #                     TASK LIST
 # -----------------------------------------------------
 @bp.route("/tasks", methods=["POST"])
-@secure_jwt_required
+@role_required("manager")
 def get_tasks_route():
-    if not require_manager():
-        return error_response("Managers only", 403)
-
     data = request.get_json() or {}
     job_id = data.get("job_id")
 
@@ -212,8 +128,10 @@ def get_tasks_route():
         return error_response("job_id is required", 400)
 
     try:
-        tasks = get_manager_tasks(manager_id(), job_id)
-        return success_response("Tasks fetched", tasks)
+        tasks, next_cursor = get_manager_tasks(get_current_manager_id(), job_id, *page_args())
+        return success_response("Tasks fetched", tasks, next_cursor=next_cursor)
+    except ValueError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         print("Tasks error:", e)
         return error_response("Internal server error", 500)
@@ -223,7 +141,7 @@ def get_tasks_route():
 #                    CREATE TASK
 # -----------------------------------------------------
 @bp.route("/assign_tasks", methods=["POST"])
-@secure_jwt_required
+@role_required()
 def create_task_route():
     try:
         data = request.json or {}
@@ -236,15 +154,35 @@ def create_task_route():
         return error_response("Internal server error", 500)
 
 
+@bp.route("/assign_tasks/bulk", methods=["POST"])
+@role_required("manager")
+def create_tasks_bulk_route():
+    data = request.get_json() or {}
+    batch_id = data.get("batch_id")
+    if not batch_id:
+        return error_response("batch_id is required", 400)
+
+    try:
+        result = create_tasks_bulk(get_current_manager_id(), batch_id, data.get("assignments"))
+        return success_response("Tasks created", result, 201)
+    except BulkTaskError as e:
+        return error_response(str(e), 400, {"errors": e.errors} if e.errors else None)
+    except LookupError as e:
+        return error_response(str(e), 404)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except Exception as e:
+        db.session.rollback()
+        print("Bulk create task error:", e)
+        return error_response("Internal server error", 500)
+
+
 # -----------------------------------------------------
 #                UPDATE TASK STATUS
 # -----------------------------------------------------
 @bp.route("/tasks/status", methods=["PATCH"])
-@secure_jwt_required
+@role_required("manager")
 def update_task_status_manager_route():
-    if not require_manager():
-        return error_response("Managers only", 403)
-
     data = request.json or {}
     task_id = data.get("task_id")
     status = data.get("status")
@@ -253,7 +191,7 @@ def update_task_status_manager_route():
         return error_response("task_id and status required", 400)
 
     try:
-        task = change_task_status(manager_id(), task_id, status)
+        task = change_task_status(get_current_manager_id(), task_id, status)
         return success_response("Task status updated", task)
     except Exception as e:
         print("Task status error:", e)
@@ -264,7 +202,7 @@ def update_task_status_manager_route():
 #                    BATCHES
 # -----------------------------------------------------
 @bp.route("/batches", methods=["GET"])
-@secure_jwt_required
+@role_required()
 def list_batches():
     manager = get_current_manager_id()
     batches = get_batches_by_manager(manager)
@@ -272,14 +210,12 @@ def list_batches():
 
 
 @bp.route("/batches", methods=["POST"])
-@secure_jwt_required
+@role_required("manager")
 def create_batch_route():
-    if not require_manager():
-        return error_response("Managers only", 403)
     data = request.json or {}
 
     try:
-        batch = add_batch(manager_id(), data)
+        batch = add_batch(get_current_manager_id(), data)
         return success_response("Batch created", batch)
     except Exception as e:
         print("Batch create error:", e)
@@ -290,14 +226,13 @@ def create_batch_route():
 #              FREELANCER LIST
 # -----------------------------------------------------
 @bp.route("/freelancers", methods=["GET"])
-@secure_jwt_required
+@role_required("manager")
 def freelancers():
-    if not require_manager():
-        return error_response("Managers only", 403)
-
     try:
-        data = get_manager_freelancers(manager_id())
-        return success_response("Freelancers fetched", data)
+        data, next_cursor = get_manager_freelancers(get_current_manager_id(), *page_args())
+        return success_response("Freelancers fetched", data, next_cursor=next_cursor)
+    except ValueError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         print("Freelancers error:", e)
         return error_response("Internal server error", 500)
@@ -307,11 +242,8 @@ def freelancers():
 #               APPLICATIONS
 # -----------------------------------------------------
 @bp.route("/batches/applications", methods=["POST"])
-@secure_jwt_required
+@role_required("manager")
 def list_batch_applications():
-    if not require_manager():
-        return error_response("Managers only", 403)
-
     data = request.json or {}
     batch_id = data.get("batch_id")
 
@@ -319,7 +251,7 @@ def list_batch_applications():
         return error_response("batch_id is required", 400)
 
     try:
-        applications = get_batch_applications(manager_id(), batch_id)
+        applications = get_batch_applications(get_current_manager_id(), batch_id)
         return success_response("Applications fetched", applications)
     except Exception as e:
         print("Applications error:", e)
@@ -327,11 +259,8 @@ def list_batch_applications():
 
 
 @bp.route("/batch_applications/status", methods=["PATCH"])
-@secure_jwt_required
+@role_required("manager")
 def update_application_status_route():
-    if not require_manager():
-        return error_response("Managers only", 403)
-
     data = request.json or {}
     application_id = data.get("application_id")
     status = data.get("status")
@@ -351,7 +280,7 @@ def update_application_status_route():
 #           BATCH MEMBERS + ASSIGNMENT
 # -----------------------------------------------------
 @bp.route("/batch_members_list", methods=["POST"])
-@secure_jwt_required
+@role_required()
 def batch_members():
     data = request.json
     batch_id = data.get("batch_id")
@@ -364,7 +293,7 @@ def batch_members():
 
 
 @bp.route("/assign-freelancer-to-project", methods=["POST"])
-@secure_jwt_required
+@role_required()
 def assign_freelancer_to_project():
     data = request.json
     batch_id = data.get("batch_id")
@@ -384,18 +313,36 @@ def assign_freelancer_to_project():
     return jsonify(result)
 
 
+# -----------------------------------------------------
+#                 DISTRIBUTE BATCH
+# -----------------------------------------------------
+@bp.route("/batches/<int:batch_id>/distribute", methods=["POST"])
+@role_required("manager")
+def distribute_batch_route(batch_id):
+    data = request.get_json() or {}
+    try:
+        result = distribute_batch(get_current_manager_id(), batch_id, data)
+        message = "Distribution preview" if data.get("dry_run") else "Batch distributed"
+        return success_response(message, result)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        db.session.rollback()
+        print("Distribute batch error:", e)
+        return error_response("Internal server error", 500)
+
+
 # -----------------------------------------------------
 #                    UPDATE BATCH
 # -----------------------------------------------------
 @bp.route("/batches/<int:batch_id>", methods=["PATCH"])
-@secure_jwt_required
+@role_required("manager")
 def update_batch_route(batch_id):
-    if not require_manager():
-        return error_response("Managers only", 403)
-
     try:
         data = request.json
-        updated = edit_batch(manager_id(), batch_id, data)
+        updated = edit_batch(get_current_manager_id(), batch_id, data)
         return success_response("Batch updated", updated)
     except Exception as e:
         print("Batch update error:", e)
@@ -406,11 +353,11 @@ def update_batch_route(batch_id):
 #                     UPDATE TASK
 # -----------------------------------------------------
 @bp.route("/tasks/<int:task_id>", methods=["PATCH"])
-@secure_jwt_required
+@role_required()
 def update_task_route(task_id):
     try:
         data = request.json
-        updated = edit_task(manager_id(), task_id, data)
+        updated = edit_task(get_current_manager_id(), task_id, data)
         return success_response("Task updated", updated)
     except Exception as e:
         print("Task update error:", e)
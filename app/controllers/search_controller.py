@@ -0,0 +1,32 @@
+from flask import Blueprint, request
+from app.services.search_service import search
+from app.auth.auth_utils import role_required, get_current_role
+from app.utils.response import success_response, error_response
+from app.utils.pagination import page_args
+from flask_jwt_extended import get_jwt_identity
+
+bp = Blueprint("search", __name__, url_prefix="/search")
+
+
+@bp.route("", methods=["GET"])
+@role_required()
+def search_route():
+    """
+    GET /search?q=...&type=all|jobs|batches&limit=&cursor=
+    Ranked matches on job title / description / skills and batch name / skills.
+    """
+    try:
+        limit, cursor = page_args()
+        results, next_cursor = search(
+            request.args.get("q"),
+            request.args.get("type"),
+            limit,
+            cursor,
+            int(get_jwt_identity()),
+            get_current_role(),
+        )
+        return success_response("Search results", results, next_cursor=next_cursor)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except PermissionError as e:
+        return error_response(str(e), 403)
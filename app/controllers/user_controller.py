@@ -11,16 +11,19 @@ from app.services.user_service import (
     signup_user,
     check_session_service,
     logout_user,
+    revoke_refresh_token,
     list_all_users_service,
     get_user_by_id_service,
     delete_user_service,
     count_users_service,
+    has_users_service,
     reset_password_service,
     forgot_password_service
 )
 from app.repositories.user_repository import is_admin_request, list_all_managers_service
-from app.repositories.revoked_token_repository import revoke_token_if_not_exists
-from app.utils.response import error_response
+from app.auth.auth_utils import role_required
+from app.utils.response import error_response, list_response
+from app.utils.pagination import page_args
 
 bp = Blueprint("user", __name__, url_prefix="/user")
 COMPANY_EMAIL_DOMAIN = "@company.com"
@@ -120,8 +123,8 @@ def check_session():
 # ---------- CREATE FIRST ADMIN ----------
 @bp.route("/create-admin", methods=["POST"])
 def create_admin():
-    total_users = count_users_service()
-    if total_users > 0:
+    users_exist = has_users_service()
+    if users_exist:
         return error_response("Admin already exists. Use regular signup with admin authorization.", 403)
 
     data = request.get_json()
@@ -129,7 +132,7 @@ def create_admin():
         return error_response("Missing JSON body", 422)
 
     data["role"] = "admin"
-    result = signup_user(total_users, data)
+    result = signup_user(users_exist, data)
     if "error" in result:
         return error_response(result["error"], result.get("code", 400))
 
@@ -144,14 +147,14 @@ def signup():
     if not data:
         return error_response("Missing JSON body", 422)
 
-    total_users = count_users_service()
-    if total_users == 0:
+    users_exist = has_users_service()
+    if not users_exist:
         return error_response("Admin not created yet. Use /create-admin first.", 403)
 
     if not is_admin_request():
         return error_response("Only admin can create new users", 403)
 
-    result = signup_user(total_users, data)
+    result = signup_user(users_exist, data)
     if "error" in result:
         return error_response(result["error"], result.get("code", 400))
 
@@ -173,18 +176,15 @@ def logout():
     try:
         verify_jwt_in_request(optional=True)
         jwt_data = get_jwt()
-        if jwt_data and jwt_data.get("jti"):
-            revoke_token_if_not_exists(jwt_data["jti"])
+        if jwt_data:
+            logout_user(jwt_data)
     except Exception:
         pass
 
     refresh_token = request.cookies.get("refresh_token_cookie")
     if refresh_token:
         try:
-            decoded_refresh = decode_token(refresh_token)
-            refresh_jti = decoded_refresh.get("jti")
-            if refresh_jti:
-                revoke_token_if_not_exists(refresh_jti)
+            revoke_refresh_token(refresh_token)
         except Exception:
             pass
 
@@ -199,29 +199,26 @@ def logout():
 
 # ---------- ADMIN USER MANAGEMENT ----------
 @bp.route("/users", methods=["GET"])
-@jwt_required()
+@role_required("admin")
 def list_all_users():
-    if not is_admin_request():
-        return error_response("Admins only", 403)
-
-    users = list_all_users_service()
+    try:
+        users, next_cursor = list_all_users_service(*page_args())
+    except ValueError as e:
+        return error_response(str(e), 400)
     try:
         csrf_token = get_csrf_token(get_jwt())
     except Exception:
         csrf_token = str(uuid.uuid4())
 
-    response = jsonify(users)
+    response, _ = list_response(users, next_cursor)
     response.set_cookie("csrf_access_token", csrf_token, httponly=False, secure=True, samesite="None", path="/")
     response.set_cookie("csrf_refresh_token", csrf_token, httponly=False, secure=True, samesite="None", path="/")
     return response, 200
 
 
 @bp.route("/managers", methods=["GET"])
-@jwt_required()
+@role_required("admin")
 def list_all_managers():
-    if not is_admin_request():
-        return error_response("Admins only", 403)
-
     managers = list_all_managers_service()
     try:
         csrf_token = get_csrf_token(get_jwt())
@@ -235,11 +232,8 @@ def list_all_managers():
 
 
 @bp.route("/users/<int:user_id>", methods=["GET"])
-@jwt_required()
+@role_required("admin")
 def get_user_by_id(user_id):
-    if not is_admin_request():
-        return error_response("Admins only", 403)
-
     user = get_user_by_id_service(user_id)
     if not user:
         return error_response("User not found", 404)
@@ -256,11 +250,8 @@ def get_user_by_id(user_id):
 
 
 @bp.route("/users/<int:user_id>", methods=["DELETE"])
-@jwt_required()
+@role_required("admin")
 def delete_user(user_id):
-    if not is_admin_request():
-        return error_response("Admins only", 403)
-
     success = delete_user_service(user_id)
     if not success:
         return error_response("User not found", 404)
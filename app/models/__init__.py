@@ -7,7 +7,14 @@ from .onboarding_model import Onboarding
 from .revoked_token import RevokedToken
 from .password_reset_otp import PasswordResetOTP
 from .batch import Batch
+from .batch_member_assignment import BatchMemberAssignment
+from .skill import Skill, SkillAlias
+from .job_skill import JobSkill
+from .freelancer_profile_skill import FreelancerProfileSkill
+from .batch_skill import BatchSkill
+from .job_attachment import JobAttachment
 from .task import Task
+from . import search_index  # full-text search indexes / FTS5 tables
 from .job_invoice import JobInvoice, JobInvoiceItem  # ✅ include both
 
 __all__ = [
@@ -20,6 +27,13 @@ __all__ = [
     "RevokedToken",
     "PasswordResetOTP",
     "Batch",
+    "BatchMemberAssignment",
+    "Skill",
+    "SkillAlias",
+    "JobSkill",
+    "FreelancerProfileSkill",
+    "BatchSkill",
+    "JobAttachment",
     "Task",
     "JobInvoice",
     "JobInvoiceItem"  # ✅ add here too
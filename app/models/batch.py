@@ -9,6 +9,7 @@ class Batch(db.Model):
     project_name = db.Column(db.String(255), nullable=False)
     project_type = db.Column(db.String(50), nullable=False)
     count = db.Column(db.Integer, default=0)
+    assigned_total = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # sum of task counts, kept in step by reserve/release
     created_by = db.Column(db.Integer, nullable=False)
     skills_required = db.Column(db.Text, nullable=True)
     deadline = db.Column(db.DateTime, nullable=True)
@@ -0,0 +1,35 @@
+from app import db
+from datetime import datetime, timezone
+
+class BatchMemberAssignment(db.Model):
+    """
+    One row per (batch, freelancer, manager) membership.
+    Replaces the JSON/CSV `BatchMember.team_members` blob.
+    """
+    __tablename__ = "batch_member_assignments"
+
+    id = db.Column(db.Integer, primary_key=True)
+    batch_id = db.Column(db.Integer, db.ForeignKey("batches.id", ondelete="CASCADE"), nullable=False)
+    freelancer_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    manager_id = db.Column(db.Integer, nullable=False)
+    assigned_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    batch = db.relationship("Batch", backref=db.backref("member_assignments", passive_deletes=True))
+    freelancer = db.relationship("User", foreign_keys=[freelancer_id])
+
+    __table_args__ = (
+        db.UniqueConstraint("batch_id", "freelancer_id", "manager_id", name="uq_batch_freelancer_manager"),
+        db.Index("ix_bma_freelancer_batch", "freelancer_id", "batch_id"),
+        db.Index("ix_bma_manager_batch", "manager_id", "batch_id"),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "batch_id": self.batch_id,
+            "freelancer_id": self.freelancer_id,
+            "manager_id": self.manager_id,
+            "assigned_count": self.assigned_count,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,18 @@
+from app import db
+
+
+class BatchSkill(db.Model):
+    """
+    Link between a batch and a canonical skill (from Batch.skills_required);
+    the (skill_id, batch_id) index doubles as the inverted index for suggestions.
+    """
+    __tablename__ = "batch_skills"
+
+    batch_id = db.Column(db.Integer, db.ForeignKey("batches.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+
+    batch = db.relationship("Batch", backref=db.backref("skill_index", passive_deletes=True))
+
+    __table_args__ = (
+        db.Index("ix_batch_skills_skill_batch", "skill_id", "batch_id"),
+    )
@@ -0,0 +1,13 @@
+from app import db
+
+
+class FreelancerProfileSkill(db.Model):
+    """Link between a freelancer profile and a canonical skill (from FreelancerProfile.skills)."""
+    __tablename__ = "freelancer_profile_skills"
+
+    profile_id = db.Column(db.Integer, db.ForeignKey("freelancer_profiles.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        db.Index("ix_profile_skills_skill_profile", "skill_id", "profile_id"),
+    )
@@ -2,6 +2,7 @@ from app import db
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import backref
+from sqlalchemy.orm import deferred
 
 class Job(db.Model):
     __tablename__ = "jobs"
@@ -11,7 +12,11 @@ class Job(db.Model):
 
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    description_file = db.Column(db.LargeBinary, nullable=True)
+    description_file = deferred(db.Column(db.LargeBinary, nullable=True))  # only read by the download endpoint
+    description_file_name = db.Column(db.String(255), nullable=True)
+    description_file_type = db.Column(db.String(100), nullable=True)
+    description_file_size = db.Column(db.BigInteger, nullable=True)
+    description_file_sha256 = db.Column(db.String(64), nullable=True)
     skills_required = db.Column(db.Text, nullable=True)
     client_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
@@ -19,6 +24,12 @@ class Job(db.Model):
     status = db.Column(db.String(20), default="open")
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     deadline = db.Column(db.DateTime, nullable=True)
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default="1")  # bumped by the ORM on every UPDATE
+
+    __mapper_args__ = {"version_id_col": version_id}
+    __table_args__ = (
+        db.Index("ix_jobs_status_id", "status", "id"),  # paged open-job listing
+    )
 
     # Relationships
     manager = relationship("User", foreign_keys=[manager_id], backref=backref("managed_jobs", lazy=True))
@@ -26,6 +37,7 @@ class Job(db.Model):
     onboardings = relationship("Onboarding", back_populates="job")
     tasks = relationship("Task", back_populates="job", cascade="all, delete-orphan")
     batches = relationship("Batch", back_populates="job", cascade="all, delete-orphan")
+    attachments = relationship("JobAttachment", backref="job", cascade="all, delete-orphan", lazy=True)
 
     # manager = relationship("User", foreign_keys=[manager_id], backref=backref("managed_jobs", lazy=True))
     # onboardings = relationship("Onboarding", back_populates="job")
@@ -47,5 +59,18 @@ class Job(db.Model):
             "deadline": self.deadline.isoformat() if self.deadline else None,
             "manager_id": self.manager_id,
             "manager_username": self.manager.username if self.manager else None,
+            "description_file": self.attachment_info(),
+        }
+
+    def attachment_info(self):
+        """Attachment metadata for listings; never touches the deferred blob."""
+        if self.description_file_size is None:
+            return None
+        return {
+            "name": self.description_file_name,
+            "content_type": self.description_file_type,
+            "size": self.description_file_size,
+            "sha256": self.description_file_sha256,
+            "url": f"/job/{self.id}/description-file",
         }
 
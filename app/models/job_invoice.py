@@ -17,6 +17,10 @@ class JobInvoice(db.Model):
     created_user_id = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
 
+    __table_args__ = (
+        db.Index("ix_job_invoices_created_at_id", "created_at", "id"),  # paged listings, newest first
+    )
+
     items = db.relationship("JobInvoiceItem", backref="invoice", cascade="all, delete-orphan")
 
     def to_dict(self):
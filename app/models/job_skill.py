@@ -0,0 +1,13 @@
+from app import db
+
+
+class JobSkill(db.Model):
+    """Link between a job and a canonical skill (from Job.skills_required)."""
+    __tablename__ = "job_skills"
+
+    job_id = db.Column(db.Integer, db.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        db.Index("ix_job_skills_skill_job", "skill_id", "job_id"),
+    )
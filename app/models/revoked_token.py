@@ -6,7 +6,8 @@ class RevokedToken(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     jti = db.Column(db.String(120), nullable=False, unique=True)
-    revoked_at  = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    revoked_at  = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)  # Bloom sync overlap window
+    expires_at = db.Column(db.DateTime, nullable=True, index=True)  # token's own `exp`; row can be pruned after this
 
     def __repr__(self):
         return f"<RevokedToken {self.jti}>"
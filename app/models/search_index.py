@@ -0,0 +1,80 @@
+from sqlalchemy import DDL, event, func, text
+
+from app import db
+from .job import Job
+from .batch import Batch
+
+# Full-text search documents for jobs and batches.
+#
+# PostgreSQL: a weighted tsvector expression per table, with a GIN index on
+# that same expression; queries must use job_document() / batch_document()
+# verbatim for the planner to pick the index.
+# SQLite (tests / local dev): external-content FTS5 tables over the same
+# columns, kept in step with the base tables by triggers.
+
+SEARCH_CONFIG = "english"
+
+# Constants are text() fragments, not literal_column(): Index binds itself to
+# the table of the first column it finds in the expression.
+_config = text(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+def _weighted(column, weight):
+    return func.setweight(
+        func.to_tsvector(_config, func.coalesce(column, text("''"))),
+        text(f"'{weight}'"),
+    )
+
+
+def job_document():
+    return (
+        _weighted(Job.title, "A")
+        .op("||")(_weighted(Job.skills_required, "B"))
+        .op("||")(_weighted(Job.description, "C"))
+    )
+
+
+def batch_document():
+    return _weighted(Batch.project_name, "A").op("||")(_weighted(Batch.skills_required, "B"))
+
+
+db.Index("ix_jobs_search", job_document(), postgresql_using="gin").ddl_if(dialect="postgresql")
+db.Index("ix_batches_search", batch_document(), postgresql_using="gin").ddl_if(dialect="postgresql")
+
+
+# ---------- SQLite FTS5 ----------
+
+# fts table -> (base table, indexed columns); column order matters for bm25 weights
+FTS_TABLES = {
+    "jobs_fts": ("jobs", ("title", "skills_required", "description")),
+    "batches_fts": ("batches", ("project_name", "skills_required")),
+}
+
+
+def _fts_ddl(fts, base, columns):
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, "
+        f"content='{base}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {base} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {base} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {base} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def fts_ddl(fts):
+    base, columns = FTS_TABLES[fts]
+    return _fts_ddl(fts, base, columns)
+
+
+for _fts, (_base, _columns) in FTS_TABLES.items():
+    _table = db.metadata.tables[_base]
+    for _statement in _fts_ddl(_fts, _base, _columns):
+        event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    event.listen(_table, "before_drop", DDL(f"DROP TABLE IF EXISTS {_fts}").execute_if(dialect="sqlite"))
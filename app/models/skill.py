@@ -0,0 +1,29 @@
+from app import db
+from app.utils.skills import MAX_SKILL_LENGTH
+
+
+class Skill(db.Model):
+    """Canonical skill vocabulary shared by profiles, jobs and batches."""
+    __tablename__ = "skills"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(MAX_SKILL_LENGTH), nullable=False, unique=True)  # case-folded, see app.utils.skills
+
+    aliases = db.relationship("SkillAlias", back_populates="skill", passive_deletes=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "aliases": [a.alias for a in self.aliases],
+        }
+
+
+class SkillAlias(db.Model):
+    """Alternative spelling that resolves to a canonical skill (e.g. "js" -> "javascript")."""
+    __tablename__ = "skill_aliases"
+
+    alias = db.Column(db.String(MAX_SKILL_LENGTH), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey("skills.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    skill = db.relationship("Skill", back_populates="aliases")
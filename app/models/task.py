@@ -17,6 +17,10 @@ class Task(db.Model):
     assigned_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     assigned_to = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
 
+    __table_args__ = (
+        db.Index("ix_tasks_job_id_id", "job_id", "id"),  # paged task listing per job
+    )
+
     # Relationships
     job = db.relationship("Job", back_populates="tasks")
     batch = db.relationship("Batch", back_populates="tasks")
@@ -11,8 +11,13 @@ class User(db.Model):
     password = db.Column(db.String(500), nullable=False)
     role = db.Column(db.String(50), nullable=False)
     manager_type = db.Column(db.String(50), nullable=True)
+    security_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # bumped to invalidate token snapshots
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        db.Index("ix_users_role_id", "role", "id"),  # paged role listings
+    )
+
     # Manager Profile
     manager_profile = db.relationship("ManagerProfile", back_populates="user", uselist=False)
 
@@ -22,6 +22,17 @@ def get_application_by_id(application_id):
 def get_application(freelancer_id, batch_id):
     return Application.query.filter_by(freelancer_id=freelancer_id, batch_id=batch_id).first()
 
+def get_applied_batch_ids(freelancer_id, batch_ids):
+    """Subset of `batch_ids` the freelancer has applied to (one IN query)."""
+    if not batch_ids:
+        return set()
+    rows = (
+        db.session.query(Application.batch_id)
+        .filter(Application.freelancer_id == freelancer_id, Application.batch_id.in_(batch_ids))
+        .all()
+    )
+    return {batch_id for (batch_id,) in rows}
+
 def has_applied(freelancer_id, batch_id) -> bool:
     """Return True if freelancer already applied for this batch"""
     return Application.query.filter_by(freelancer_id=freelancer_id, batch_id=batch_id).first() is not None
@@ -0,0 +1,57 @@
+# app/repositories/attachment_repository.py
+
+from app import db
+from app.models.job_attachment import JobAttachment
+
+
+def add_job_attachment(job_id, sha256, size, filename, content_type=None, uploaded_by=None):
+    """
+    Records a stored file on a job (caller commits). Re-uploading the same
+    content under the same name returns the existing row.
+    """
+    existing = JobAttachment.query.filter_by(job_id=job_id, sha256=sha256, filename=filename).first()
+    if existing:
+        return existing
+
+    attachment = JobAttachment(
+        job_id=job_id,
+        sha256=sha256,
+        size=size,
+        filename=filename,
+        content_type=content_type,
+        uploaded_by=uploaded_by
+    )
+    db.session.add(attachment)
+    return attachment
+
+
+def list_job_attachments(job_id):
+    return (
+        JobAttachment.query
+        .filter_by(job_id=job_id)
+        .order_by(JobAttachment.id)
+        .all()
+    )
+
+
+def get_job_attachment(job_id, attachment_id):
+    return JobAttachment.query.filter_by(id=attachment_id, job_id=job_id).first()
+
+
+def delete_job_attachment(attachment):
+    """Removes the row only; the stored file is reclaimed by prune once unreferenced."""
+    db.session.delete(attachment)
+    db.session.commit()
+
+
+def referenced_hashes(hashes):
+    """Subset of `hashes` still referenced by at least one attachment."""
+    if not hashes:
+        return set()
+    rows = (
+        db.session.query(JobAttachment.sha256)
+        .filter(JobAttachment.sha256.in_(hashes))
+        .distinct()
+        .all()
+    )
+    return {sha256 for (sha256,) in rows}
@@ -1,10 +1,18 @@
 from app.models.batch import Batch
 from app import db
 from app.models.BatchMember import BatchMember
+from app.models.batch_member_assignment import BatchMemberAssignment
+from app.models.batch_skill import BatchSkill
 from app.models.user import User
+from app.models.task import Task
 import json
+from sqlalchemy import func, or_
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
 from dateutil import parser
+from app.repositories.skill_repository import sync_batch_skills
+from app.services.suggestion_cache import suggestion_cache
 
 
 # ---------------- Batch CRUD ----------------
@@ -20,6 +28,8 @@ def create_batch(job_id, project_name, project_type, count, created_by, skills_r
         deadline=deadline
     )
     db.session.add(batch)
+    db.session.flush()
+    sync_batch_skills(batch)
     db.session.commit()
     return batch
 
@@ -50,14 +60,123 @@ def update_batch(batch_id, data):
             else:
                 setattr(batch, field, data[field])
 
+    if "skills_required" in data:
+        sync_batch_skills(batch)
+
     try:
         db.session.commit()
+        suggestion_cache.invalidate_all()
         return batch
     except SQLAlchemyError as e:
         db.session.rollback()
         raise e
 
 
+# ---------------- Skill Index ----------------
+
+def load_recommendation_candidates(skill_ids):
+    """
+    Scoring inputs for every open batch (active, with capacity left) sharing a
+    skill with `skill_ids`, in set-based queries (no per-batch round trips):
+      batches:     [(id, count, assigned_total, deadline)]
+      links:       [(batch_id, skill_id)] for all skills of those batches
+      skill_batch_counts: {skill_id: number of batches requiring it}
+    plus the total number of batches (for IDF weights).
+    """
+    candidates = (
+        db.session.query(Batch.id)
+        .filter(
+            Batch.id.in_(
+                db.session.query(BatchSkill.batch_id).filter(BatchSkill.skill_id.in_(skill_ids))
+            ),
+            or_(Batch.status == "active", Batch.status.is_(None)),
+            Batch.assigned_total < func.coalesce(Batch.count, 0)
+        )
+    )
+    batches = (
+        db.session.query(Batch.id, Batch.count, Batch.assigned_total, Batch.deadline)
+        .filter(Batch.id.in_(candidates))
+        .all()
+    )
+    # A batch may open or fill up between the two reads; keep links consistent with `batches`
+    open_ids = {batch_id for batch_id, *_ in batches}
+    links = [
+        link for link in
+        db.session.query(BatchSkill.batch_id, BatchSkill.skill_id)
+        .filter(BatchSkill.batch_id.in_(candidates))
+        .all()
+        if link[0] in open_ids
+    ]
+    involved = db.session.query(BatchSkill.skill_id).filter(BatchSkill.batch_id.in_(candidates))
+    skill_batch_counts = dict(
+        db.session.query(BatchSkill.skill_id, func.count(BatchSkill.batch_id))
+        .filter(BatchSkill.skill_id.in_(involved))
+        .group_by(BatchSkill.skill_id)
+        .all()
+    )
+    # IDF only needs the corpus size roughly: max(id) is one index seek where
+    # count(*) scans the table (it overcounts deleted batches, which is harmless)
+    total_batches = db.session.query(func.max(Batch.id)).scalar() or 0
+    return batches, links, skill_batch_counts, total_batches
+
+
+
+# ---------------- Batch Capacity ----------------
+
+def reserve_batch_capacity(batch_id, units):
+    """
+    Atomically reserves `units` of the batch's capacity with a single conditional
+    UPDATE; concurrent reservations serialize on the batch row, so the batch can
+    never be over-allocated. Returns True on success. Does not commit.
+    """
+    result = db.session.execute(
+        db.update(Batch)
+        .where(
+            Batch.id == batch_id,
+            Batch.assigned_total + units <= func.coalesce(Batch.count, 0)
+        )
+        .values(assigned_total=Batch.assigned_total + units)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def release_batch_capacity(batch_id, units):
+    """Gives `units` back to the batch (task shrunk or removed). Does not commit."""
+    db.session.execute(
+        db.update(Batch)
+        .where(Batch.id == batch_id)
+        .values(assigned_total=db.case(
+            (Batch.assigned_total > units, Batch.assigned_total - units),
+            else_=0
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def get_remaining_capacity(batch_id):
+    row = db.session.query(Batch.count, Batch.assigned_total).filter(Batch.id == batch_id).first()
+    if not row:
+        return 0
+    return max(int(row.count or 0) - int(row.assigned_total or 0), 0)
+
+
+def recount_batch_assigned_totals():
+    """
+    Rebuilds batches.assigned_total from the tasks table (backfill / repair).
+    Returns the number of batches updated.
+    """
+    totals = (
+        db.session.query(func.coalesce(func.sum(Task.count), 0))
+        .filter(Task.batch_id == Batch.id)
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        db.update(Batch).values(assigned_total=totals).execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
 
 # ---------------- Batch Members ----------------
 
@@ -65,32 +184,171 @@ def update_batch(batch_id, data):
 #     batch_member = BatchMember.query.filter_by(batch_id=batch_id).first()
 #     return {"team_members": batch_member.get_team_members() if batch_member else []}
 
+def get_team_members_by_batch(batch_ids):
+    """
+    Returns {batch_id: [{"id", "name", "assigned_count"}, ...]} for the given
+    batches in one query, combining memberships from all managers.
+    """
+    if not batch_ids:
+        return {}
+
+    rows = (
+        db.session.query(
+            BatchMemberAssignment.batch_id,
+            User.id,
+            User.username,
+            func.sum(BatchMemberAssignment.assigned_count),
+        )
+        .join(User, User.id == BatchMemberAssignment.freelancer_id)
+        .filter(BatchMemberAssignment.batch_id.in_(batch_ids))
+        .group_by(BatchMemberAssignment.batch_id, User.id, User.username)
+        .order_by(BatchMemberAssignment.batch_id, User.username)
+        .all()
+    )
+
+    members = {}
+    for batch_id, user_id, username, assigned_count in rows:
+        members.setdefault(batch_id, []).append(
+            {"id": user_id, "name": username, "assigned_count": int(assigned_count or 0)}
+        )
+    return members
+
+
+def get_batch_workloads(batch_id):
+    """
+    Returns [(freelancer_id, username, units)] for every team member of the
+    batch, where units is the sum of their task counts in this batch.
+    """
+    loads = (
+        db.session.query(Task.assigned_to.label("freelancer_id"), func.sum(Task.count).label("units"))
+        .filter(Task.batch_id == batch_id)
+        .group_by(Task.assigned_to)
+        .subquery()
+    )
+    team = db.session.query(BatchMemberAssignment.freelancer_id).filter(
+        BatchMemberAssignment.batch_id == batch_id
+    )
+    rows = (
+        db.session.query(User.id, User.username, func.coalesce(loads.c.units, 0))
+        .outerjoin(loads, loads.c.freelancer_id == User.id)
+        .filter(User.id.in_(team))
+        .order_by(User.id)
+        .all()
+    )
+    return [(user_id, username, int(units)) for user_id, username, units in rows]
+
+
 def get_batch_members(batch_id):
     """
-    Returns combined team members for a batch, handling both JSON and CSV formats.
+    Returns combined team members for a batch as a comma-separated string of usernames.
     """
-    batch_members_rows = BatchMember.query.filter_by(batch_id=batch_id).all()
-    all_members = []
+    members = get_team_members_by_batch([batch_id]).get(batch_id, [])
+    return {"team_members": ",".join(m["name"] for m in members)}
 
-    for bm in batch_members_rows:
-        if not bm.team_members:
-            continue
-        try:
-            # Try parsing as JSON first
-            members = json.loads(bm.team_members)
-            all_members += members
-        except Exception:
-            # Fallback: comma-separated string
-            names = [name.strip() for name in bm.team_members.split(",") if name.strip()]
-            for idx, name in enumerate(names, start=1):
-                all_members.append({"id": 0, "name": name})
 
-    # Remove duplicates by freelancer name
-    unique_members = {m['name']: m for m in all_members}.values()
-    # Convert to comma-separated string
-    team_members_str = ",".join([m["name"] for m in unique_members])
+def get_batches_for_freelancer(freelancer_id):
+    """
+    Returns the freelancer's batches with their memberships and full team in a
+    single query: the freelancer's assignments (ix_bma_freelancer_batch) joined
+    to each batch and, through the batch, to every teammate's assignment.
 
-    return {"team_members": team_members_str}
+    Yields rows of (Batch, manager_id, assignment_id, joined_at, teammate_username).
+    """
+    team = aliased(BatchMemberAssignment)
+    return (
+        db.session.query(
+            Batch,
+            BatchMemberAssignment.manager_id,
+            BatchMemberAssignment.id,
+            BatchMemberAssignment.created_at,
+            User.username,
+        )
+        .join(Batch, Batch.id == BatchMemberAssignment.batch_id)
+        .join(team, team.batch_id == BatchMemberAssignment.batch_id)
+        .join(User, User.id == team.freelancer_id)
+        .filter(BatchMemberAssignment.freelancer_id == freelancer_id)
+        .order_by(Batch.id, BatchMemberAssignment.id, User.username)
+        .all()
+    )
+
+
+def is_batch_member(batch_id, freelancer_id):
+    return db.session.query(
+        BatchMemberAssignment.query.filter_by(batch_id=batch_id, freelancer_id=freelancer_id).exists()
+    ).scalar()
+
+
+def get_member_batch_ids(freelancer_id, batch_ids):
+    """Subset of `batch_ids` the freelancer is already a member of (one IN query)."""
+    if not batch_ids:
+        return set()
+    rows = (
+        db.session.query(BatchMemberAssignment.batch_id)
+        .filter(
+            BatchMemberAssignment.freelancer_id == freelancer_id,
+            BatchMemberAssignment.batch_id.in_(batch_ids)
+        )
+        .distinct()
+        .all()
+    )
+    return {batch_id for (batch_id,) in rows}
+
+
+def upsert_batch_member(batch_id, freelancer_id, manager_id, assigned_delta=0):
+    """
+    Adds the freelancer to the manager's team for this batch, or bumps their
+    assigned_count if already there, in one statement. Does not commit.
+    """
+    upsert_batch_members(batch_id, manager_id, {freelancer_id: assigned_delta})
+
+
+def upsert_batch_members(batch_id, manager_id, deltas):
+    """
+    Multi-row version of upsert_batch_member: `deltas` maps freelancer_id to
+    the number of units to add. One statement for all rows. Does not commit.
+    """
+    if not deltas:
+        return
+
+    rows = [
+        {
+            "batch_id": batch_id,
+            "freelancer_id": freelancer_id,
+            "manager_id": manager_id,
+            "assigned_count": delta,
+        }
+        for freelancer_id, delta in deltas.items()
+    ]
+    conflict_cols = ["batch_id", "freelancer_id", "manager_id"]
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(BatchMemberAssignment).values(rows)
+        if any(deltas.values()):
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_cols,
+                set_={"assigned_count": BatchMemberAssignment.assigned_count + stmt.excluded.assigned_count},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_cols)
+        db.session.execute(stmt)
+        return
+
+    existing = {
+        a.freelancer_id: a
+        for a in BatchMemberAssignment.query.filter(
+            BatchMemberAssignment.batch_id == batch_id,
+            BatchMemberAssignment.manager_id == manager_id,
+            BatchMemberAssignment.freelancer_id.in_(list(deltas))
+        )
+    }
+    for row in rows:
+        assignment = existing.get(row["freelancer_id"])
+        if assignment:
+            assignment.assigned_count = (assignment.assigned_count or 0) + row["assigned_count"]
+        else:
+            db.session.add(BatchMemberAssignment(**row))
 
 
 # ---------------- Assign Freelancers ----------------
@@ -102,78 +360,56 @@ def assign_freelancers_to_batch(manager_id, batch_id, freelancer_ids):
     if int(batch.created_by) != int(manager_id):
         return {"success": False, "error": "Unauthorized manager"}
 
-    # Fetch freelancers
-    freelancers = User.query.filter(User.id.in_(freelancer_ids), User.role=="freelancer").all()
+    # Only real freelancers can join
+    freelancer_ids = [
+        row.id for row in
+        db.session.query(User.id).filter(User.id.in_(freelancer_ids), User.role == "freelancer").all()
+    ]
 
-    # Get or create BatchMember for this manager
-    batch_member = BatchMember.query.filter_by(batch_id=batch.id, manager_id=manager_id).first()
-    current_members = batch_member.get_team_members() if batch_member else []
-
-    # Convert current members to dict for quick lookup
-    member_dict = {m["id"]: m for m in current_members}
-
-    # Add new freelancers without duplicates
-    for f in freelancers:
-        if f.id not in member_dict:
-            member_dict[f.id] = {"id": f.id, "name": f.username}
+    for freelancer_id in freelancer_ids:
+        upsert_batch_member(batch.id, freelancer_id, manager_id)
+    db.session.commit()
 
-    updated_members = list(member_dict.values())
+    # Return combined members from all managers for this batch
+    members = get_team_members_by_batch([batch.id]).get(batch.id, [])
+    return {"success": True, "freelancers": [{"id": m["id"], "name": m["name"]} for m in members]}
 
-    if batch_member:
-        batch_member.set_team_members(updated_members)
-    else:
-        batch_member = BatchMember(
-            batch_id=batch.id,
-            project_id=batch.job_id,
-            manager_id=manager_id,
-            team_members=json.dumps(updated_members)
-        )
-        db.session.add(batch_member)
 
+def add_freelancer_to_batch(batch_id, project_id, manager_id, freelancer_id):
+    upsert_batch_member(batch_id, freelancer_id, manager_id)
     db.session.commit()
+    return True
 
-    # Return combined members from all managers for this batch
-    all_batch_members = BatchMember.query.filter_by(batch_id=batch.id).all()
-    combined_members = []
-    for bm in all_batch_members:
-        combined_members += bm.get_team_members() if bm.team_members else []
 
-    # Remove duplicates across managers
-    unique_members = {m["id"]: m for m in combined_members}.values()
-    simplified_members = [{"id": m["id"], "name": m["name"]} for m in unique_members]
+# ---------------- Get Batches by Manager ----------------
 
-    return {"success": True, "freelancers": simplified_members}
+def load_manager_batches(manager_id):
+    """
+    Bulk loader for a manager's batches, in two queries regardless of batch count:
+      1. batches, carrying their materialized assigned_total
+      2. team members of all those batches (one IN query)
 
+    Returns a list of (batch, total_assigned, remaining_tasks, members).
+    """
+    batches = Batch.query.filter_by(created_by=manager_id).order_by(Batch.id).all()
+    members_by_batch = get_team_members_by_batch([batch.id for batch in batches])
+
+    result = []
+    for batch in batches:
+        capacity = int(batch.count or 0)
+        total_assigned = min(int(batch.assigned_total or 0), capacity)  # clamp to batch.count
+        result.append((batch, total_assigned, capacity - total_assigned, members_by_batch.get(batch.id, [])))
+    return result
 
-# ---------------- Get Batches by Manager ----------------
 
 def get_batches_by_manager(manager_id):
     """
     Returns all batches created by the manager, with combined team members from all managers.
     """
-    batches = Batch.query.filter_by(created_by=manager_id).all()
     result = []
 
-    for batch in batches:
-        batch_members_rows = BatchMember.query.filter_by(batch_id=batch.id).all()
-        all_members = []
-
-        for bm in batch_members_rows:
-            if not bm.team_members:
-                continue
-            try:
-                # Try parsing as JSON first
-                members = json.loads(bm.team_members)
-                all_members += members
-            except Exception:
-                # Fallback: comma-separated string
-                names = [name.strip() for name in bm.team_members.split(",") if name.strip()]
-                for idx, name in enumerate(names, start=1):
-                    all_members.append({"id": 0, "name": name})
-
-        # Remove duplicates by freelancer name
-        unique_members = {m['name']: m for m in all_members}.values()
-        team_members_str = ",".join([m["name"] for m in unique_members])
+    for batch, total_assigned, remaining_tasks, members in load_manager_batches(manager_id):
+        team_members_str = ",".join(m["name"] for m in members)
 
         result.append({
             "id": batch.id,
@@ -184,8 +420,74 @@ def get_batches_by_manager(manager_id):
             "deadline": batch.deadline.isoformat() if batch.deadline else None,
             "created_at": batch.created_at.isoformat() if batch.created_at else None,
             "count": batch.count,
-            "team_members": team_members_str
+            "team_members": team_members_str,
+            "total_assigned": total_assigned,
+            "remaining_tasks": remaining_tasks
         })
 
     return result
 
+
+# ---------------- Legacy membership backfill ----------------
+
+def _parse_legacy_team_members(raw):
+    """Parses a BatchMember.team_members blob (JSON list or CSV of names)."""
+    if not raw:
+        return []
+    try:
+        members = json.loads(raw)
+        return [m for m in members if isinstance(m, dict)]
+    except Exception:
+        return [{"id": 0, "name": name.strip()} for name in raw.split(",") if name.strip()]
+
+
+def backfill_batch_member_assignments(chunk_size=500):
+    """
+    Copies legacy BatchMember.team_members blobs into batch_member_assignments.
+    Idempotent: existing assignments keep the larger assigned_count.
+    Returns the number of assignments created or updated.
+    """
+    usernames = dict(db.session.query(User.username, User.id).all())
+    valid_ids = set(usernames.values())
+    touched = 0
+    last_id = 0
+
+    while True:
+        rows = (
+            BatchMember.query.filter(BatchMember.id > last_id)
+            .order_by(BatchMember.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        for bm in rows:
+            last_id = bm.id
+            for m in _parse_legacy_team_members(bm.team_members):
+                freelancer_id = m.get("id") if m.get("id") in valid_ids else usernames.get(m.get("name") or m.get("username"))
+                if not freelancer_id:
+                    continue
+
+                count = int(m.get("assigned_count") or 0)
+                assignment = BatchMemberAssignment.query.filter_by(
+                    batch_id=bm.batch_id, freelancer_id=freelancer_id, manager_id=bm.manager_id
+                ).first()
+                if assignment:
+                    if count > (assignment.assigned_count or 0):
+                        assignment.assigned_count = count
+                        touched += 1
+                else:
+                    db.session.add(BatchMemberAssignment(
+                        batch_id=bm.batch_id,
+                        freelancer_id=freelancer_id,
+                        manager_id=bm.manager_id,
+                        assigned_count=count,
+                        created_at=bm.created_at
+                    ))
+                    db.session.flush()
+                    touched += 1
+
+        db.session.commit()
+
+    return touched
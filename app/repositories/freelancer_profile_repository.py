@@ -1,10 +1,12 @@
 # app/repositories/freelancer_profile_repository.py
 from app import db
 from app.models.freelancer_profile import FreelancerProfile
+from app.repositories.skill_repository import sync_profile_skills
 
 
 def save_profile(profile):
     db.session.add(profile)
+    sync_profile_skills(profile)
     db.session.commit()
 
 def get_profile_by_user_id(user_id):
@@ -20,5 +22,8 @@ def update_profile(user_id, data):
         if hasattr(profile, field) and value is not None:
             setattr(profile, field, value)
 
+    if data.get("skills") is not None:
+        sync_profile_skills(profile)
+
     db.session.commit()
     return True, None
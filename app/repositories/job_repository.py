@@ -2,6 +2,16 @@
 
 from app import db
 from app.models.job import Job
+from app.models.user import User
+from app.models.batch import Batch
+from app.models.task import Task
+from app.models.batch_member_assignment import BatchMemberAssignment
+from sqlalchemy import func, update
+import hashlib
+from sqlalchemy.orm import joinedload, selectinload
+from app.repositories.skill_repository import sync_job_skills
+from app.utils.pagination import keyset_page
+from app.services.admin_stats import admin_stats
 
 def create_job(title, description, project_type, created_by, skills_required=None, status="open"):
     job = Job(
@@ -13,19 +23,183 @@ def create_job(title, description, project_type, created_by, skills_required=Non
         status=status
     )
     db.session.add(job)
+    sync_job_skills(job)
     db.session.commit()
+    admin_stats.adjust("jobs", status)
     return job
 
 
 def save_job(job):
+    status = job.status or "open"
     db.session.add(job)
+    sync_job_skills(job)
     db.session.commit()
+    admin_stats.adjust("jobs", status)
+
+def with_job_people(query):
+    """
+    Eager-loads what Job.to_dict reads (creator and manager usernames) in the
+    same SELECT, instead of two lazy loads per job.
+    """
+    return query.options(
+        joinedload(Job.created_by_user).load_only(User.id, User.username),
+        joinedload(Job.manager).load_only(User.id, User.username),
+    )
 
 def fetch_all_jobs():
-    return Job.query.all()
+    return with_job_people(Job.query).all()
 
 def fetch_open_jobs():
-    return Job.query.filter_by(status="open").all()
+    return with_job_people(Job.query.filter_by(status="open")).all()
+
+def fetch_jobs_page(limit, cursor=None, status=None):
+    """One page of jobs by id, optionally only those with `status`. Returns (jobs, next_cursor)."""
+    query = Job.query if status is None else Job.query.filter_by(status=status)
+    return keyset_page(with_job_people(query), [Job.id], limit, cursor)
+
+def fetch_full_project(job_id, manager_id):
+    """
+    The manager's job with batches -> tasks -> assignee loaded by selectinload:
+    one IN query per level (per 500 keys) instead of a joined row per task,
+    and no lazy loads while serializing.
+    """
+    return (
+        Job.query
+        .filter_by(id=job_id, manager_id=manager_id)
+        .options(
+            selectinload(Job.batches)
+            .selectinload(Batch.tasks)
+            .selectinload(Task.assigned_to_user)
+            .load_only(User.id, User.username, User.email)
+        )
+        .first()
+    )
+
+def fetch_jobs_by_ids(job_ids):
+    return with_job_people(Job.query.filter(Job.id.in_(job_ids))).all()
+
+def fetch_job_by_id(job_id):
+    return with_job_people(Job.query.filter(Job.id == job_id)).first()
+
+# ---------------- Description file ----------------
+
+def set_job_attachment(job, content, filename=None, content_type=None):
+    """Stores (or clears, when content is None) the job's description file and its metadata. Does not commit."""
+    if content is None:
+        job.description_file = None
+        job.description_file_name = job.description_file_type = None
+        job.description_file_size = job.description_file_sha256 = None
+        return
+
+    job.description_file = content
+    job.description_file_name = filename
+    job.description_file_type = content_type or "application/octet-stream"
+    job.description_file_size = len(content)
+    job.description_file_sha256 = hashlib.sha256(content).hexdigest()
+
+
+def get_job_attachment_meta(job_id):
+    """Access and metadata columns of the job, without the blob."""
+    return (
+        db.session.query(
+            Job.id, Job.manager_id, Job.status,
+            Job.description_file_name, Job.description_file_type,
+            Job.description_file_size, Job.description_file_sha256,
+        )
+        .filter(Job.id == job_id)
+        .first()
+    )
+
+
+def read_job_attachment(job_id, start, length):
+    """`length` bytes of the blob from offset `start`, sliced in SQL so the whole file is never loaded."""
+    return db.session.query(
+        func.substr(Job.description_file, start + 1, length)
+    ).filter(Job.id == job_id).scalar()
+
+
+def backfill_job_attachment_meta(chunk_size=100, read_size=1024 * 1024):
+    """
+    Fills description_file_size / _sha256 for jobs whose blob predates those
+    columns, `chunk_size` jobs per transaction. PostgreSQL computes both in
+    SQL; elsewhere the blob is hashed in `read_size` slices, so no file is
+    loaded whole. Bumps version_id so cached project ETags change. Returns
+    the number of jobs updated.
+    """
+    pending = db.and_(Job.description_file.isnot(None), Job.description_file_size.is_(None))
+    in_sql = db.session.get_bind().dialect.name == "postgresql"
+
+    updated = 0
+    while True:
+        ids = [job_id for (job_id,) in
+               db.session.query(Job.id).filter(pending).order_by(Job.id).limit(chunk_size).all()]
+        if not ids:
+            break
+
+        if in_sql:
+            db.session.execute(
+                update(Job)
+                .where(Job.id.in_(ids))
+                .values(
+                    description_file_size=func.length(Job.description_file),
+                    description_file_sha256=func.encode(func.sha256(Job.description_file), "hex"),
+                    version_id=Job.version_id + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            for job_id in ids:
+                size = db.session.query(func.length(Job.description_file)).filter(Job.id == job_id).scalar()
+                digest = hashlib.sha256()
+                for start in range(0, size, read_size):
+                    digest.update(read_job_attachment(job_id, start, read_size))
+                db.session.execute(
+                    update(Job)
+                    .where(Job.id == job_id)
+                    .values(
+                        description_file_size=size,
+                        description_file_sha256=digest.hexdigest(),
+                        version_id=Job.version_id + 1,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+
+        db.session.commit()
+        updated += len(ids)
+    return updated
+
+
+def get_job_summary(job_id):
+    """Batch, unit, task and team counts for one job, from three aggregate queries."""
+    batches, units, assigned = (
+        db.session.query(
+            func.count(Batch.id),
+            func.coalesce(func.sum(Batch.count), 0),
+            func.coalesce(func.sum(Batch.assigned_total), 0),
+        )
+        .filter(Batch.job_id == job_id)
+        .one()
+    )
+    tasks_by_status = dict(
+        db.session.query(Task.status, func.count(Task.id))
+        .filter(Task.job_id == job_id)
+        .group_by(Task.status)
+        .all()
+    )
+    members = (
+        db.session.query(func.count(func.distinct(BatchMemberAssignment.freelancer_id)))
+        .join(Batch, Batch.id == BatchMemberAssignment.batch_id)
+        .filter(Batch.job_id == job_id)
+        .scalar()
+    )
+    return {
+        "batches": batches,
+        "total_units": int(units),
+        "assigned_units": int(assigned),
+        "tasks": sum(tasks_by_status.values()),
+        "tasks_by_status": tasks_by_status,
+        "team_members": members or 0,
+    }
 
 def count_total_jobs():
     return Job.query.count()
@@ -35,12 +209,26 @@ def count_completed_jobs():
 
 
 # app/repositories/job_repository.py
-def assign_manager_to_job(project_id, manager_id):
-    job = Job.query.get(project_id)
-    if not job:
-        raise Exception("Project not found")
+def set_jobs_manager(job_ids, manager_id):
+    """
+    Sets manager_id on all `job_ids` with one UPDATE ... RETURNING and commits.
+    version_id is bumped by hand, as an ORM flush would, so project ETags change.
+    Returns the updated rows as (id, title, status); ids not returned do not exist.
+    """
+    if not job_ids:
+        return []
 
-    job.manager_id = manager_id
-    db.session.add(job)
+    rows = db.session.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids))
+        .values(manager_id=manager_id, version_id=Job.version_id + 1)
+        .returning(Job.id, Job.title, Job.status)
+    ).all()
     db.session.commit()
-    return job
+    return rows
+
+
+def assign_manager_to_job(project_id, manager_id):
+    if not set_jobs_manager([project_id], manager_id):
+        raise Exception("Project not found")
+    return Job.query.get(project_id)
@@ -3,6 +3,9 @@ from app import db
 from sqlalchemy import func
 from app.models.manager_profile import ManagerProfile
 from app.models.user import User
+from app.repositories.user_repository import bump_security_version
+from app.repositories.skill_repository import sync_job_skills
+from app.services.admin_stats import admin_stats
 
 def get_manager_profile(user_id):
     return ManagerProfile.query.filter_by(user_id=user_id).first()
@@ -56,6 +59,9 @@ def update_manager_profile(user_id, data):
         if field in data:
             setattr(user, field, data[field])
 
+    if any(field in data for field in user_fields):
+        bump_security_version(user)
+
     db.session.commit()
     return profile
 
@@ -89,8 +95,11 @@ def insert_job(manager_id, job_data):
         manager_id=manager_id,
         created_by=manager_id
     )
+    status = job.status
     db.session.add(job)
+    sync_job_skills(job)
     db.session.commit()
+    admin_stats.adjust("jobs", status)
     return job
 
 def fetch_jobs_by_manager(manager_id):
@@ -0,0 +1,24 @@
+from app import db
+from app.models.password_reset_otp import PasswordResetOTP
+from datetime import datetime, timezone
+
+def delete_expired_otps(chunk_size=1000):
+    """
+    Deletes expired password-reset OTPs in bounded chunks. Returns rows deleted.
+    """
+    now = datetime.now(timezone.utc)
+
+    deleted = 0
+    while True:
+        ids = [
+            row.id for row in
+            db.session.query(PasswordResetOTP.id).filter(PasswordResetOTP.expires_at < now).limit(chunk_size).all()
+        ]
+        if not ids:
+            break
+        PasswordResetOTP.query.filter(PasswordResetOTP.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        deleted += len(ids)
+        if len(ids) < chunk_size:
+            break
+    return deleted
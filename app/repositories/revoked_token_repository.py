@@ -1,16 +1,87 @@
 from app import db
 from app.models.revoked_token import RevokedToken
-from datetime import datetime, timezone
+from app.auth.token_blocklist import blocklist
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+# Longest-lived token we issue (refresh); rows without `expires_at`
+# are safe to drop once they are older than this.
+MAX_TOKEN_LIFETIME = timedelta(days=7)
 
 def is_token_revoked(jti: str) -> bool:
     return db.session.query(RevokedToken).filter_by(jti=jti).first() is not None
 
-def revoke_token_if_not_exists(jti: str):
+def fetch_revoked_since(last_id: int, since=None):
+    """
+    Returns (id, jti) pairs for tokens revoked after the given row id, plus
+    (when `since` is given) every row revoked at or after `since`.
+
+    Serial ids can commit out of order, so a row with an id below `last_id`
+    may become visible after a later id was already read; the `since`
+    window re-reads recent rows to pick those up.
     """
-    Blacklist the token JTI if it does not already exist.
+    newer = RevokedToken.id > last_id
+    if since is not None:
+        newer = db.or_(newer, RevokedToken.revoked_at >= since)
+    return (
+        db.session.query(RevokedToken.id, RevokedToken.jti)
+        .filter(newer)
+        .order_by(RevokedToken.id)
+        .all()
+    )
+
+def revoke_token_if_not_exists(jti: str, exp=None):
     """
-    if not RevokedToken.query.filter_by(jti=jti).first():
-        revoked = RevokedToken(jti=jti, revoked_at=datetime.now(timezone.utc))
-        db.session.add(revoked)
+    Blacklist the token JTI if it does not already exist, in one round trip
+    (INSERT ... ON CONFLICT DO NOTHING), and record it in this worker's blocklist.
+    `exp` is the token's expiry claim (epoch seconds), kept so the row can be pruned.
+    """
+    values = {
+        "jti": jti,
+        "revoked_at": datetime.now(timezone.utc),
+        "expires_at": datetime.fromtimestamp(exp, timezone.utc) if exp else None,
+    }
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(RevokedToken).values(**values).on_conflict_do_nothing(index_elements=["jti"])
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(RevokedToken).values(**values).on_conflict_do_nothing(index_elements=["jti"])
+    else:
+        stmt = None
+
+    try:
+        if stmt is not None:
+            db.session.execute(stmt)
+        else:
+            db.session.add(RevokedToken(**values))
         db.session.commit()
+    except IntegrityError:
+        db.session.rollback()  # already revoked by a concurrent request
+
+    blocklist.add(jti)
     return True
+
+def delete_expired_tokens(chunk_size=1000):
+    """
+    Deletes revoked-token rows whose token has expired, `chunk_size` rows per
+    transaction so the table is never locked for long. Returns rows deleted.
+    """
+    now = datetime.now(timezone.utc)
+    expired = db.or_(
+        RevokedToken.expires_at < now,
+        db.and_(RevokedToken.expires_at.is_(None), RevokedToken.revoked_at < now - MAX_TOKEN_LIFETIME)
+    )
+
+    deleted = 0
+    while True:
+        ids = [row.id for row in db.session.query(RevokedToken.id).filter(expired).limit(chunk_size).all()]
+        if not ids:
+            break
+        RevokedToken.query.filter(RevokedToken.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        deleted += len(ids)
+        if len(ids) < chunk_size:
+            break
+    return deleted
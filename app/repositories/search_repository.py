@@ -0,0 +1,163 @@
+# app/repositories/search_repository.py
+
+import html
+import re
+
+from sqlalchemy import Float, String, cast, column, func, literal_column, select, table, text, union_all
+
+from app import db
+from app.models.job import Job
+from app.models.batch import Batch
+from app.models.search_index import SEARCH_CONFIG, FTS_TABLES, fts_ddl, job_document, batch_document
+from app.utils.pagination import keyset_page
+
+# Highlight markers used inside the database; swapped for <mark> after HTML-escaping
+_START, _STOP = "\x02", "\x03"
+_HEADLINE_OPTIONS = (
+    f'StartSel="{_START}", StopSel="{_STOP}", MinWords=8, MaxWords=24, '
+    'MaxFragments=2, FragmentDelimiter=" … "'
+)
+_SNIPPET_TOKENS = 16
+
+_config = text(f"'{SEARCH_CONFIG}'::regconfig")
+_jobs_fts = table("jobs_fts", column("rowid"))
+_batches_fts = table("batches_fts", column("rowid"))
+
+
+def search_documents(q, kinds, limit, cursor=None, job_filters=(), batch_filters=()):
+    """
+    One page of jobs and/or batches matching `q`, best match first.
+    `kinds` is a subset of {"job", "batch"}; the filters are extra WHERE
+    criteria (access rules). Returns ([{type, id, title, rank, snippet}], next_cursor).
+    Snippets are only built for the rows on the page.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        match = _pg_query(q)
+        parts = {
+            "job": _pg_select("job", Job, job_document(), match, job_filters),
+            "batch": _pg_select("batch", Batch, batch_document(), match, batch_filters),
+        }
+    elif dialect == "sqlite":
+        match = _fts_query(q)
+        parts = {
+            "job": _fts_select("job", Job, _jobs_fts, "10.0, 4.0, 1.0", match, job_filters),
+            "batch": _fts_select("batch", Batch, _batches_fts, "10.0, 4.0", match, batch_filters),
+        }
+    else:
+        raise NotImplementedError(f"Full-text search is not available on {dialect}")
+
+    results = union_all(*(parts[kind] for kind in sorted(kinds))).subquery("results")
+    query = db.session.query(results.c.kind, results.c.id, results.c.title, results.c.rank)
+    rows, next_cursor = keyset_page(
+        query, [results.c.rank, results.c.kind, results.c.id], limit, cursor, descending=True
+    )
+
+    snippets = {}
+    for kind in kinds:
+        ids = [row.id for row in rows if row.kind == kind]
+        if ids:
+            fetch = _pg_snippets if dialect == "postgresql" else _fts_snippets
+            snippets.update({(kind, i): s for i, s in fetch(kind, ids, match)})
+
+    return [
+        {
+            "type": row.kind,
+            "id": row.id,
+            "title": row.title,
+            "rank": row.rank,
+            "snippet": _highlight(snippets.get((row.kind, row.id))),
+        }
+        for row in rows
+    ], next_cursor
+
+
+def rebuild_search_index():
+    """
+    SQLite: creates any missing FTS5 tables / triggers (databases created
+    before search existed) and reindexes them from the base tables.
+    PostgreSQL needs nothing: the GIN indexes are on expressions of the rows.
+    Returns the names of the rebuilt tables.
+    """
+    if db.session.get_bind().dialect.name != "sqlite":
+        return []
+
+    for fts in FTS_TABLES:
+        for statement in fts_ddl(fts):
+            db.session.execute(text(statement))
+        db.session.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+    db.session.commit()
+    return list(FTS_TABLES)
+
+
+def _highlight(snippet):
+    if not snippet:
+        return None
+    return html.escape(snippet).replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+# ---------- PostgreSQL: tsvector + GIN ----------
+
+def _pg_query(q):
+    # websearch syntax: "quoted phrases", OR, -excluded
+    return func.websearch_to_tsquery(_config, q)
+
+
+def _pg_select(kind, model, document, match, filters):
+    title = model.title if model is Job else model.project_name
+    return (
+        select(
+            literal_column(f"'{kind}'", String).label("kind"),
+            model.id.label("id"),
+            title.label("title"),
+            cast(func.ts_rank_cd(document, match), Float(53)).label("rank"),
+        )
+        .where(document.op("@@")(match), *filters)
+    )
+
+
+def _pg_snippets(kind, ids, match):
+    if kind == "job":
+        model, source = Job, func.coalesce(Job.description, "")
+    else:
+        model, source = Batch, func.concat_ws(" · ", Batch.project_name, Batch.skills_required)
+    return db.session.execute(
+        select(model.id, func.ts_headline(_config, source, match, _HEADLINE_OPTIONS))
+        .where(model.id.in_(ids))
+    ).all()
+
+
+# ---------- SQLite: FTS5 ----------
+
+def _fts_query(q):
+    """Every word must match; words are quoted so FTS5 operators in user input are inert."""
+    words = re.findall(r"\w+", q)
+    if not words:
+        raise ValueError("Search query has no searchable words")
+    return " ".join(f'"{word}"' for word in words)
+
+
+def _fts_select(kind, model, fts, weights, match, filters):
+    title = model.title if model is Job else model.project_name
+    return (
+        select(
+            literal_column(f"'{kind}'", String).label("kind"),
+            model.id.label("id"),
+            title.label("title"),
+            (-func.bm25(literal_column(fts.name), text(weights))).label("rank"),
+        )
+        .select_from(fts.join(model, model.id == fts.c.rowid))
+        .where(literal_column(fts.name).op("MATCH")(match), *filters)
+    )
+
+
+def _fts_snippets(kind, ids, match):
+    fts = _jobs_fts if kind == "job" else _batches_fts
+    snippet_column = 2 if kind == "job" else -1  # jobs: description; batches: best column
+    return db.session.execute(
+        select(
+            fts.c.rowid,
+            func.snippet(literal_column(fts.name), snippet_column, _START, _STOP, "…", _SNIPPET_TOKENS),
+        )
+        .where(literal_column(fts.name).op("MATCH")(match), fts.c.rowid.in_(ids))
+    ).all()
@@ -0,0 +1,171 @@
+from app import db
+from app.models.skill import Skill, SkillAlias
+from app.models.job import Job
+from app.models.job_skill import JobSkill
+from app.models.batch import Batch
+from app.models.batch_skill import BatchSkill
+from app.models.freelancer_profile import FreelancerProfile
+from app.models.freelancer_profile_skill import FreelancerProfileSkill
+from app.utils.skills import MAX_SKILL_LENGTH, normalize_skill, normalize_skills
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+# ---------------- Vocabulary ----------------
+
+def resolve_skill_ids(skills):
+    """
+    Maps raw skills (list or CSV) to canonical skill ids, following aliases
+    and creating unknown skills. Returns unique ids in input order. Does not commit.
+    Names longer than MAX_SKILL_LENGTH are skipped by normalize_skills, so an
+    oversized token never reaches the skills insert.
+    """
+    keys = normalize_skills(skills)
+    if not keys:
+        return []
+
+    aliased = dict(
+        db.session.query(SkillAlias.alias, SkillAlias.skill_id).filter(SkillAlias.alias.in_(keys)).all()
+    )
+    names = [k for k in keys if k not in aliased]
+    known = dict(
+        db.session.query(Skill.name, Skill.id).filter(Skill.name.in_(names)).all()
+    ) if names else {}
+
+    missing = [k for k in names if k not in known]
+    if missing:
+        _insert_skill_names(missing)
+        known.update(
+            db.session.query(Skill.name, Skill.id).filter(Skill.name.in_(missing)).all()
+        )
+
+    ids = []
+    for key in keys:
+        skill_id = aliased.get(key) or known.get(key)
+        if skill_id and skill_id not in ids:
+            ids.append(skill_id)
+    return ids
+
+
+def _insert_skill_names(names):
+    # Concurrent writers may create the same skill; let the unique name win.
+    rows = [{"name": name} for name in names]
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        db.session.execute(insert(Skill).values(rows).on_conflict_do_nothing(index_elements=["name"]))
+    else:
+        db.session.add_all(Skill(**row) for row in rows)
+        db.session.flush()
+
+
+def add_skill_alias(alias, canonical):
+    """
+    Makes `alias` resolve to `canonical` (created if needed). If `alias` was
+    already a skill of its own, its links are merged into the canonical skill.
+    Commits. Returns the canonical Skill.
+    """
+    alias_key, canonical_key = normalize_skill(alias), normalize_skill(canonical)
+    if not alias_key or not canonical_key or alias_key == canonical_key:
+        raise ValueError("Alias and canonical skill must be different, non-empty names")
+    if len(alias_key) > MAX_SKILL_LENGTH or len(canonical_key) > MAX_SKILL_LENGTH:
+        raise ValueError(f"Skill names must be at most {MAX_SKILL_LENGTH} characters")
+
+    [skill_id] = resolve_skill_ids([canonical_key])
+    old = Skill.query.filter_by(name=alias_key).first()
+    if old and old.id != skill_id:
+        for link, owner_col in _LINKS:
+            owners_with_canonical = db.session.query(owner_col).filter(link.skill_id == skill_id)
+            link.query.filter(link.skill_id == old.id, owner_col.in_(owners_with_canonical)).delete(
+                synchronize_session=False
+            )
+            link.query.filter(link.skill_id == old.id).update({"skill_id": skill_id}, synchronize_session=False)
+        SkillAlias.query.filter_by(skill_id=old.id).update({"skill_id": skill_id}, synchronize_session=False)
+        db.session.delete(old)
+
+    existing = db.session.get(SkillAlias, alias_key)
+    if existing:
+        existing.skill_id = skill_id
+    else:
+        db.session.add(SkillAlias(alias=alias_key, skill_id=skill_id))
+    db.session.commit()
+    return db.session.get(Skill, skill_id)
+
+
+def list_skills():
+    return Skill.query.order_by(Skill.name).all()
+
+
+# ---------------- Links ----------------
+
+_LINKS = [
+    (FreelancerProfileSkill, FreelancerProfileSkill.profile_id),
+    (JobSkill, JobSkill.job_id),
+    (BatchSkill, BatchSkill.batch_id),
+]
+
+
+def _replace_links(link, owner_col, owner_id, skills):
+    link.query.filter(owner_col == owner_id).delete(synchronize_session=False)
+    skill_ids = resolve_skill_ids(skills)
+    if skill_ids:
+        db.session.execute(
+            db.insert(link),
+            [{owner_col.key: owner_id, "skill_id": skill_id} for skill_id in skill_ids]
+        )
+
+
+def sync_profile_skills(profile):
+    """Rewrites the profile's skill links from FreelancerProfile.skills. Does not commit."""
+    if profile.id is None:
+        db.session.flush()
+    _replace_links(FreelancerProfileSkill, FreelancerProfileSkill.profile_id, profile.id, profile.skills)
+
+
+def sync_job_skills(job):
+    """Rewrites the job's skill links from Job.skills_required. Does not commit."""
+    if job.id is None:
+        db.session.flush()
+    _replace_links(JobSkill, JobSkill.job_id, job.id, job.skills_required)
+
+
+def sync_batch_skills(batch):
+    """Rewrites the batch's skill links from Batch.skills_required. Does not commit."""
+    if batch.id is None:
+        db.session.flush()
+    _replace_links(BatchSkill, BatchSkill.batch_id, batch.id, batch.skills_required)
+
+
+def profile_skill_ids(profile_id):
+    """Subquery of the profile's skill ids, for use in IN / join filters."""
+    return db.session.query(FreelancerProfileSkill.skill_id).filter(
+        FreelancerProfileSkill.profile_id == profile_id
+    )
+
+
+# ---------------- Backfill ----------------
+
+def backfill_skill_links(chunk_size=500):
+    """
+    Builds the skill links for every profile, job and batch from their CSV
+    columns, committing every `chunk_size` rows.
+    Returns {"profiles": n, "jobs": n, "batches": n}.
+    """
+    counts = {}
+    for key, model, sync in (
+        ("profiles", FreelancerProfile, sync_profile_skills),
+        ("jobs", Job, sync_job_skills),
+        ("batches", Batch, sync_batch_skills),
+    ):
+        done = 0
+        last_id = 0
+        while True:
+            rows = model.query.filter(model.id > last_id).order_by(model.id).limit(chunk_size).all()
+            if not rows:
+                break
+            for row in rows:
+                sync(row)
+            db.session.commit()
+            done += len(rows)
+            last_id = rows[-1].id
+        counts[key] = done
+    return counts
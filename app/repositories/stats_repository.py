@@ -0,0 +1,37 @@
+# app/repositories/stats_repository.py
+
+from sqlalchemy import String, func, literal_column, select, union_all
+
+from app import db
+from app.models.user import User
+from app.models.job import Job
+from app.models.task import Task
+from app.models.job_invoice import JobInvoice
+
+# dimension -> grouped column
+COUNTER_DIMENSIONS = {
+    "users": User.role,
+    "jobs": Job.status,
+    "tasks": Task.status,
+    "invoices": JobInvoice.status,
+}
+
+
+def load_admin_counters():
+    """
+    Row counts per dimension and key ({"jobs": {"open": 3, ...}, ...}),
+    as one UNION ALL of GROUP BY counts, i.e. a single round trip.
+    """
+    parts = [
+        select(
+            literal_column(f"'{dimension}'", String).label("dimension"),
+            column.label("bucket"),
+            func.count().label("total"),
+        ).group_by(column)
+        for dimension, column in COUNTER_DIMENSIONS.items()
+    ]
+
+    counters = {dimension: {} for dimension in COUNTER_DIMENSIONS}
+    for dimension, bucket, total in db.session.execute(union_all(*parts)):
+        counters[dimension][bucket or "unset"] = total
+    return counters
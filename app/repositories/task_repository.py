@@ -1,23 +1,25 @@
 from app.models.task import Task
 from app.models.batch import Batch
-from app.models.BatchMember import BatchMember
 from app.models.user import User
+from app.repositories.batch_repository import (
+    upsert_batch_member,
+    upsert_batch_members,
+    reserve_batch_capacity,
+    release_batch_capacity,
+    get_remaining_capacity
+)
 from app import db
-import json
+from dateutil import parser
+from sqlalchemy import insert
 from sqlalchemy.exc import SQLAlchemyError
 
 
-def safe_json_load(value):
-    """
-    Safely loads JSON data from a string.
-    Returns [] if value is empty or invalid.
-    """
-    try:
-        if not value:
-            return []
-        return json.loads(value)
-    except (json.JSONDecodeError, TypeError, ValueError):
-        return []
+class BulkTaskError(ValueError):
+    """Raised by create_tasks_bulk; `errors` lists {"index", "error"} per rejected row."""
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = errors or []
 
 
 def create_task(data):
@@ -27,10 +29,11 @@ def create_task(data):
       - Required fields
       - Freelancer existence
       - Batch existence
-      - Remaining task count
+      - Remaining task count (reserved atomically on the batch row)
     Updates:
+      - Batch assigned_total
       - Task table
-      - BatchMember assigned_count (JSON-safe)
+      - Batch membership assigned_count
     """
     # -----------------------------
     # 1️⃣  Extract and validate fields
@@ -67,11 +70,11 @@ def create_task(data):
         raise ValueError("Batch not found")
 
     # -----------------------------
-    # 3️⃣  Check remaining available tasks
+    # 3️⃣  Reserve remaining available tasks
     # -----------------------------
-    total_assigned = sum(int(t.count) for t in Task.query.filter_by(batch_id=batch_id).all())
-    remaining_tasks = int(batch.count) - total_assigned
-    if task_count > remaining_tasks:
+    if not reserve_batch_capacity(batch_id, task_count):
+        db.session.rollback()
+        remaining_tasks = get_remaining_capacity(batch_id)
         raise ValueError(f"Cannot assign more than remaining tasks ({remaining_tasks}) in this batch")
 
     # -----------------------------
@@ -90,36 +93,9 @@ def create_task(data):
     db.session.add(task)
 
     # -----------------------------
-    # 5️⃣  Update BatchMember JSON safely
+    # 5️⃣  Add / bump batch membership (single upsert)
     # -----------------------------
-    batch_member = BatchMember.query.filter_by(batch_id=batch_id, manager_id=manager_id).first()
-
-    current_members = safe_json_load(batch_member.team_members if batch_member else None)
-
-    found = False
-    for m in current_members:
-        if m.get("id") == assigned_to_id:
-            m["assigned_count"] = int(m.get("assigned_count", 0)) + task_count
-            found = True
-            break
-
-    if not found:
-        current_members.append({
-            "id": assigned_to_id,
-            "name": freelancer.username,
-            "assigned_count": task_count
-        })
-
-    if batch_member:
-        batch_member.team_members = json.dumps(current_members)
-    else:
-        batch_member = BatchMember(
-            batch_id=batch_id,
-            project_id=job_id,
-            manager_id=manager_id,
-            team_members=json.dumps(current_members)
-        )
-        db.session.add(batch_member)
+    upsert_batch_member(batch_id, assigned_to_id, manager_id, task_count)
 
     # -----------------------------
     # 6️⃣  Commit transaction safely
@@ -137,6 +113,132 @@ def create_task(data):
     return task.to_dict(include_batch=True, include_freelancer=True)
 
 
+def create_tasks_bulk(manager_id, batch_id, assignments):
+    """
+    Creates many tasks under one batch in a single transaction (all-or-nothing).
+    Each assignment: {assigned_to_username, count, title, description, deadline?}.
+
+    Raises LookupError for a missing batch and PermissionError when the batch
+    belongs to another manager. Validates every row first and raises
+    BulkTaskError listing all bad rows; then reserves the combined count once,
+    inserts all tasks with one executemany and bumps team membership with one
+    multi-row upsert.
+    """
+    if not isinstance(assignments, list) or not assignments:
+        raise BulkTaskError("assignments must be a non-empty list")
+
+    batch = Batch.query.get(batch_id)
+    if not batch:
+        raise LookupError("Batch not found")
+    if int(batch.created_by) != int(manager_id):
+        raise PermissionError("Unauthorized")
+
+    # -----------------------------
+    # 1️⃣  Resolve all freelancers in one query
+    # -----------------------------
+    usernames = {a.get("assigned_to_username") for a in assignments if isinstance(a, dict)}
+    usernames.discard(None)
+    freelancer_ids = dict(
+        db.session.query(User.username, User.id)
+        .filter(User.username.in_(usernames), User.role == "freelancer")
+        .all()
+    ) if usernames else {}
+
+    # -----------------------------
+    # 2️⃣  Validate every row, collecting errors
+    # -----------------------------
+    rows, errors = [], []
+    for index, item in enumerate(assignments):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "error": "Assignment must be an object"})
+            continue
+
+        title = item.get("title")
+        description = item.get("description")
+        username = item.get("assigned_to_username")
+        if not all([title, description, username, item.get("count")]):
+            errors.append({"index": index, "error": "Missing required task fields"})
+            continue
+
+        try:
+            task_count = int(item["count"])
+        except (TypeError, ValueError):
+            errors.append({"index": index, "error": "Count must be an integer"})
+            continue
+        if task_count <= 0:
+            errors.append({"index": index, "error": "Count must be greater than 0"})
+            continue
+
+        if username not in freelancer_ids:
+            errors.append({"index": index, "error": "Freelancer not found"})
+            continue
+
+        deadline = None
+        if item.get("deadline"):
+            try:
+                deadline = parser.isoparse(item["deadline"])
+            except (TypeError, ValueError):
+                errors.append({"index": index, "error": "Invalid deadline format"})
+                continue
+
+        rows.append({
+            "job_id": batch.job_id,
+            "batch_id": batch_id,
+            "title": title,
+            "description": description,
+            "count": task_count,
+            "status": "pending",
+            "deadline": deadline,
+            "assigned_by": manager_id,
+            "assigned_to": freelancer_ids[username],
+        })
+
+    if errors:
+        raise BulkTaskError("Some assignments are invalid", errors)
+
+    return insert_task_rows(manager_id, batch_id, rows)
+
+
+def insert_task_rows(manager_id, batch_id, rows):
+    """
+    Reserves the combined count of already-validated task rows, inserts them
+    with one executemany and bumps team membership with one upsert; commits.
+    """
+    # -----------------------------
+    # 3️⃣  Reserve the combined count once
+    # -----------------------------
+    total = sum(row["count"] for row in rows)
+    if not reserve_batch_capacity(batch_id, total):
+        db.session.rollback()
+        remaining_tasks = get_remaining_capacity(batch_id)
+        raise BulkTaskError(
+            f"Cannot assign {total} tasks, only {remaining_tasks} remaining in this batch"
+        )
+
+    # -----------------------------
+    # 4️⃣  Insert tasks + membership, then commit
+    # -----------------------------
+    deltas = {}
+    for row in rows:
+        deltas[row["assigned_to"]] = deltas.get(row["assigned_to"], 0) + row["count"]
+
+    try:
+        task_ids = db.session.scalars(insert(Task).returning(Task.id), rows).all()
+        upsert_batch_members(batch_id, manager_id, deltas)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print("Bulk task insert failed:", repr(e))
+        raise
+
+    return {
+        "batch_id": batch_id,
+        "created": len(task_ids),
+        "task_ids": task_ids,
+        "total_assigned": total,
+    }
+
+
 
 def get_tasks_by_batch(batch_id):
     return Task.query.filter_by(batch_id=batch_id).all()
@@ -167,6 +269,7 @@ def get_tasks_by_manager(manager_id):
 
 def delete_tasks_by_batch(batch_id):
     Task.query.filter_by(batch_id=batch_id).delete()
+    Batch.query.filter_by(id=batch_id).update({"assigned_total": 0}, synchronize_session=False)
     db.session.commit()
 
 
@@ -191,15 +294,19 @@ def update_task(task_id, data):
             elif field == "count":
                 try:
                     count_val = int(data[field])
-                    if count_val <= 0:
-                        raise ValueError("Count must be > 0")
-                    total_assigned = sum(t.count for t in Task.query.filter_by(batch_id=task.batch_id).all()) - task.count
-                    remaining_tasks = task.batch.count - total_assigned
-                    if count_val > remaining_tasks:
-                        raise ValueError(f"Cannot assign more than remaining tasks ({remaining_tasks})")
-                    task.count = count_val
-                except ValueError:
+                except (TypeError, ValueError):
                     raise ValueError("Count must be integer")
+                if count_val <= 0:
+                    raise ValueError("Count must be > 0")
+
+                delta = count_val - int(task.count or 0)
+                if delta > 0 and not reserve_batch_capacity(task.batch_id, delta):
+                    db.session.rollback()
+                    remaining_tasks = get_remaining_capacity(task.batch_id) + int(task.count or 0)
+                    raise ValueError(f"Cannot assign more than remaining tasks ({remaining_tasks})")
+                if delta < 0:
+                    release_batch_capacity(task.batch_id, -delta)
+                task.count = count_val
             else:
                 setattr(task, field, data[field])
 
@@ -1,25 +1,47 @@
 from app.models.user import User
-from flask_jwt_extended import get_jwt, verify_jwt_in_request, get_jwt_identity
 from app import db
-from werkzeug.security import generate_password_hash
+from sqlalchemy import event
+from app.auth.auth_utils import get_current_role
+from app.auth.password_hasher import passwords
+from app.auth.session_snapshot import security_versions
 
 def is_admin_request():
     try:
-        verify_jwt_in_request()
-        identity = get_jwt_identity()
-        claims = get_jwt()
-        print(f"User ID: {identity}, Role: {claims.get('role')}")
-        return claims.get("role", "").lower() == "admin"
+        return get_current_role() == "admin"
     except Exception as e:
         print("JWT Error:", str(e))
         return False
 
+def get_security_version(user_id):
+    """Returns the user's security version, or None if the user no longer exists."""
+    return db.session.query(User.security_version).filter(User.id == user_id).scalar()
+
+def bump_security_version(user, deleted=False):
+    """
+    Invalidates session snapshots issued for this user.
+    Call before committing a change to (or deletion of) the user; the cached
+    version is dropped once that commit lands, so a concurrent request cannot
+    re-cache the old version in between.
+    """
+    if not deleted:
+        user.security_version = (user.security_version or 0) + 1
+    user_id = user.id
+    event.listen(
+        db.session(), "after_commit",
+        lambda session: security_versions.forget(user_id),
+        once=True
+    )
+
 def get_user_by_email(email):
     return User.query.filter_by(email=email).first()
 
 def count_users():
     return User.query.count()
 
+def has_users():
+    """True once any user exists; an EXISTS probe instead of a full COUNT."""
+    return db.session.query(User.query.exists()).scalar()
+
 def get_all_users():
     return User.query.all()
 
@@ -45,6 +67,7 @@ def get_user_by_id(user_id):
 def delete_user_by_id(user_id):
     user = User.query.get(user_id)
     if user:
+        bump_security_version(user, deleted=True)
         db.session.delete(user)
         db.session.commit()
         return True
@@ -60,27 +83,23 @@ def update_user_by_id(user_id, data):
     if 'role' in data:
         user.role = data['role']
     if 'password' in data:
-        user.password = generate_password_hash(data['password'])
+        user.password = passwords.hash(data['password'])
 
+    bump_security_version(user)
     db.session.commit()
     return True
 
 
 def is_manager_request():
     try:
-        verify_jwt_in_request()
-        claims = get_jwt()
-        return claims.get("role", "").lower() == "manager"
+        return get_current_role() == "manager"
     except Exception as e:
         print("JWT Error:", str(e))
         return False
 
 def is_freelancer_request():
     try:
-        verify_jwt_in_request()
-        claims = get_jwt()
-        # print("JWT Claims for freelancer check:", claims)
-        return claims.get("role", "").lower() == "freelancer"
+        return get_current_role() == "freelancer"
     except Exception as e:
         print("JWT verification failed:", e)
         return False
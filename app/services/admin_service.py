@@ -1,15 +1,40 @@
-from app.repositories.user_repository import count_users
 from app import db
 from app.models.job import Job
 
 from app.models.user import User
+from app.repositories.skill_repository import sync_job_skills
+from app.repositories.job_repository import (
+    fetch_jobs_page,
+    set_jobs_manager,
+    fetch_job_by_id,
+    get_job_summary,
+    set_job_attachment
+)
+from app.repositories.attachment_repository import (
+    add_job_attachment,
+    list_job_attachments,
+    get_job_attachment,
+    delete_job_attachment
+)
+from app.services.attachment_store import attachment_store
+from app.services.admin_stats import admin_stats
+from app.services.suggestion_cache import suggestion_cache
+from app.repositories.stats_repository import load_admin_counters
+from werkzeug.utils import secure_filename
+import hashlib
+import json
 
 
 def get_admin_stats():
+    counters = admin_stats.get(load_admin_counters)
     return {
-        "total_users": count_users(),
-        "total_projects": Job.query.count(),
-        "completed_projects": Job.query.filter_by(status="completed").count()
+        "total_users": sum(counters["users"].values()),
+        "total_projects": sum(counters["jobs"].values()),
+        "completed_projects": counters["jobs"].get("completed", 0),
+        "users_by_role": counters["users"],
+        "projects_by_status": counters["jobs"],
+        "tasks_by_status": counters["tasks"],
+        "invoices_by_status": counters["invoices"],
     }
 
 
@@ -17,23 +42,74 @@ def create_project(admin_id, data):
     project = Job(
         title=data["title"],
         description=data.get("description"),
-        description_file = data.get("description_file"),
         project_type=data["project_type"],
         skills_required=data.get("required_skills"),
         status="open",
         created_by=admin_id
     )
+    _attach_upload(project, data.get("description_file"))
     db.session.add(project)
+    sync_job_skills(project)
     db.session.commit()
+    admin_stats.adjust("jobs", "open")
     return project
 
 
-def list_projects():
-    projects = Job.query.all()
-    return [p.to_dict() for p in projects]
+def _attach_upload(project, upload):
+    """Stores an uploaded description file (werkzeug FileStorage) on the job."""
+    if upload is None or not hasattr(upload, "read"):
+        return
+    set_job_attachment(project, upload.read(), secure_filename(upload.filename or "") or None, upload.mimetype)
 
 
-def update_project(project_id, data, files=None):
+def _store_uploads(project, uploads, uploaded_by=None):
+    """Streams uploaded files (werkzeug FileStorage) into the attachment store and records them on the job."""
+    attachments = []
+    for upload in uploads or []:
+        if upload is None or not upload.filename:
+            continue
+        sha256, size = attachment_store.save(upload.stream)
+        attachments.append(add_job_attachment(
+            project.id,
+            sha256,
+            size,
+            secure_filename(upload.filename) or "file",
+            upload.mimetype or None,
+            uploaded_by
+        ))
+    return attachments
+
+
+def list_projects(limit, cursor=None):
+    projects, next_cursor = fetch_jobs_page(limit, cursor)
+    return [p.to_dict() for p in projects], next_cursor
+
+
+def get_project(project_id, include_summary=False):
+    """
+    One project by primary key, optionally with aggregate summary counts.
+    Returns (project_dict, etag) or (None, None). The ETag changes whenever
+    the job row (version_id), its people or the summary change.
+    """
+    project = fetch_job_by_id(project_id)
+    if not project:
+        return None, None
+
+    data = project.to_dict()
+    data["attachments"] = [a.to_dict() for a in list_job_attachments(project.id)]
+    tag = [
+        project.id, project.version_id, data["created_by_username"], data["manager_username"],
+        [a["id"] for a in data["attachments"]],
+    ]
+    if include_summary:
+        data["summary"] = get_job_summary(project.id)
+        tag.append(data["summary"])
+
+    etag = hashlib.sha1(json.dumps(tag, sort_keys=True, default=str).encode()).hexdigest()
+    return data, etag
+
+
+def update_project(project_id, data, files=None, admin_id=None):
     project = Job.query.get(project_id)
     if not project:
         raise Exception("Project not found")
@@ -42,45 +118,64 @@ def update_project(project_id, data, files=None):
     project.title = data.get("title", project.title)
     project.description = data.get("description", project.description)
     project.project_type = data.get("project_type", project.project_type)
-    project.skills_required = data.get("skills_required", project.skills_required)
-    project.status = data.get("status", project.status)
+    if "skills_required" in data:
+        project.skills_required = data["skills_required"]
+        sync_job_skills(project)
+    old_status = project.status
+    project.status = new_status = data.get("status", project.status)
+    _attach_upload(project, data.get("description_file"))
 
     # ✅ Handle optional file uploads (only if files exist)
     if files:
-        uploaded_files = []
-        for f in files:
-            filename = f.filename
-            save_path = f"uploads/{filename}"  # adjust this to your uploads directory
-            f.save(save_path)
-            uploaded_files.append(filename)
-
-        # Store filenames in DB (assuming you have a `files` JSON column)
-        existing_files = project.files or []
-        project.files = existing_files + uploaded_files
+        _store_uploads(project, files, admin_id)
 
     db.session.commit()
+    admin_stats.move("jobs", old_status, new_status)
     return project
 
 
+# ---------------- Attachments ----------------
 
-def delete_project(project_id):
+def add_project_attachments(project_id, uploads, admin_id=None):
     project = Job.query.get(project_id)
     if not project:
-        raise Exception("Project not found")
+        raise LookupError("Project not found")
 
-    db.session.delete(project)
+    attachments = _store_uploads(project, uploads, admin_id)
     db.session.commit()
+    return [a.to_dict() for a in attachments]
+
+
+def list_project_attachments(project_id):
+    return [a.to_dict() for a in list_job_attachments(project_id)]
+
+
+def remove_project_attachment(project_id, attachment_id):
+    attachment = get_job_attachment(project_id, attachment_id)
+    if not attachment:
+        raise LookupError("Attachment not found")
+    delete_job_attachment(attachment)
     return True
 
 
-def assign_manager(project_id, manager_id):
+
+def delete_project(project_id):
     project = Job.query.get(project_id)
     if not project:
         raise Exception("Project not found")
 
-    project.manager_id = manager_id
+    status = project.status
+    db.session.delete(project)
     db.session.commit()
-    return project
+    admin_stats.adjust("jobs", status, -1)
+    suggestion_cache.invalidate_all()  # its batches went with it
+    return True
+
+
+def assign_manager(project_id, manager_id):
+    if not set_jobs_manager([project_id], manager_id):
+        raise Exception("Project not found")
+    return Job.query.get(project_id)
 
 
 def close_project(project_id):
@@ -88,36 +183,50 @@ def close_project(project_id):
     if not project:
         raise Exception("Project not found")
 
+    old_status = project.status
     project.status = "completed"
     db.session.commit()
+    admin_stats.move("jobs", old_status, "completed")
     return project
 
 
 
 def assign_manager_to_jobs(job_ids, manager_username):
-    from app.models.job import Job
     from app.models.user import User
     from app import db
 
     # Fetch manager by username
-    manager = User.query.filter_by(username=manager_username).first()
+    # (a plain row, so it is not expired and reloaded by the commit below)
+    manager = (
+        db.session.query(User.id, User.username, User.role)
+        .filter(User.username == manager_username)
+        .first()
+    )
     if not manager or manager.role != "manager":
         return {"message": "Invalid manager username"}, 400
 
-    assigned_jobs = []
-    not_found_jobs = []
-
-    for job_id in job_ids:
-        job = Job.query.get(job_id)
-        if not job:
-            not_found_jobs.append(job_id)
-            continue
-
-        # Assign manager
-        job.manager_id = manager.id
-        assigned_jobs.append(job.to_dict())
-
-    db.session.commit()
+    def as_id(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    # One UPDATE ... RETURNING for all jobs; ids it did not return do not exist
+    wanted = [as_id(job_id) for job_id in job_ids]
+    rows = set_jobs_manager(list({i for i in wanted if i is not None}), manager.id)
+    updated = {row.id: row for row in rows}
+
+    assigned_jobs = [
+        {
+            "id": job_id,
+            "title": updated[job_id].title,
+            "status": updated[job_id].status,
+            "manager_id": manager.id,
+            "manager_username": manager.username,
+        }
+        for job_id in dict.fromkeys(i for i in wanted if i in updated)  # request order, no repeats
+    ]
+    not_found_jobs = [job_id for job_id, wanted_id in zip(job_ids, wanted) if wanted_id not in updated]
 
     return {
         "message": f"Manager {manager.username} assigned to {len(assigned_jobs)} jobs",
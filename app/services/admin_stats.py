@@ -0,0 +1,72 @@
+import copy
+import threading
+import time
+
+
+class AdminStatsCache:
+    """
+    Per-worker cache of the admin dashboard counters (row counts per
+    dimension and key, e.g. jobs by status).
+
+    A miss loads every counter with one aggregate query and keeps it for
+    ADMIN_STATS_TTL seconds. Write paths in this worker adjust the cached
+    counters in place, so their changes show up immediately; changes made
+    by other workers (and task / invoice changes) show up within the TTL.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = None  # {dimension: {key: count}}
+        self._expires_at = 0
+        self._generation = 0
+        self.ttl = 30
+
+    def init_app(self, app):
+        self.ttl = app.config.get("ADMIN_STATS_TTL", self.ttl)
+        self.clear()
+
+    # ---------- Public API ----------
+    def get(self, loader):
+        """Cached counters, or `loader()` -> counters on a miss. Returns a copy."""
+        with self._lock:
+            if self._counters is not None and self._expires_at > time.monotonic():
+                return copy.deepcopy(self._counters)
+            generation = self._generation
+
+        counters = loader()
+
+        with self._lock:
+            # An adjustment made while loading may or may not be in the result; drop it then
+            if generation == self._generation:
+                self._counters = copy.deepcopy(counters)
+                self._expires_at = time.monotonic() + self.ttl
+        return counters
+
+    def adjust(self, dimension, key, delta=1):
+        """Add `delta` to one counter (call after the change is committed)."""
+        key = key or "unset"
+        with self._lock:
+            self._generation += 1
+            if self._counters is None:
+                return
+            counts = self._counters.setdefault(dimension, {})
+            total = counts.get(key, 0) + delta
+            if total > 0:
+                counts[key] = total
+            else:
+                counts.pop(key, None)  # absent, as in a fresh GROUP BY
+
+    def move(self, dimension, old_key, new_key):
+        """One row changed key, e.g. a job's status went from open to completed."""
+        if old_key != new_key:
+            self.adjust(dimension, old_key, -1)
+            self.adjust(dimension, new_key, 1)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._counters = None
+            self._expires_at = 0
+
+
+admin_stats = AdminStatsCache()
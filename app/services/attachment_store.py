@@ -0,0 +1,117 @@
+import hashlib
+import os
+import tempfile
+import time
+
+
+class AttachmentStore:
+    """
+    Content-addressed file store for job attachments.
+
+    Files live at <root>/<aa>/<bb>/<sha256>, so identical uploads share a
+    single file on disk. Uploads are copied in ATTACHMENT_CHUNK_SIZE pieces
+    to a temp file while hashing and then renamed into place, so memory use
+    does not depend on the file size.
+
+    Files are never removed when a row goes away; `prune` deletes the ones
+    no row references any more (see `flask prune-attachments`).
+    """
+
+    def __init__(self):
+        self.root = None
+        self.chunk_size = 1024 * 1024
+
+    def init_app(self, app):
+        root = app.config.get("ATTACHMENT_DIR") or "attachments"
+        if not os.path.isabs(root):
+            root = os.path.join(app.instance_path, root)
+        self.root = root
+        self.chunk_size = app.config.get("ATTACHMENT_CHUNK_SIZE", self.chunk_size)
+        os.makedirs(self._tmp_dir(), exist_ok=True)
+
+    # ---------- Public API ----------
+    def path_for(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def exists(self, sha256):
+        return os.path.isfile(self.path_for(sha256))
+
+    def save(self, stream):
+        """Streams a binary file object into the store. Returns (sha256, size)."""
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp_dir())
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+
+            sha256 = digest.hexdigest()
+            path = self.path_for(sha256)
+            try:
+                # Already stored; refresh mtime so a concurrent prune keeps it
+                os.utime(path)
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                # New content, or pruned just now; either way put our copy in place
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return sha256, size
+
+    def prune(self, is_referenced, min_age=3600):
+        """
+        Deletes stored files (and abandoned temp files) older than `min_age`
+        seconds whose hash is not referenced. `is_referenced(hashes)` returns
+        the referenced subset of a list of hashes. Returns the number removed.
+
+        Each file's mtime is checked again right before it is removed, so a
+        file reused by a deduplicated upload after the scan (whose row may
+        not be committed yet) is kept.
+        """
+        cutoff = time.time() - min_age
+        removed = 0
+
+        for name in os.listdir(self._tmp_dir()):
+            path = os.path.join(self._tmp_dir(), name)
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+
+        for prefix in os.listdir(self.root):
+            if len(prefix) != 2:
+                continue
+            for dirpath, _, names in os.walk(os.path.join(self.root, prefix)):
+                stale = [n for n in names if os.path.getmtime(os.path.join(dirpath, n)) < cutoff]
+                if not stale:
+                    continue
+                keep = is_referenced(stale)
+                for name in stale:
+                    if name in keep:
+                        continue
+                    path = os.path.join(dirpath, name)
+                    try:
+                        if os.path.getmtime(path) >= cutoff:
+                            continue  # touched by an upload since the scan
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                    removed += 1
+        return removed
+
+    # ---------- Internals ----------
+    def _tmp_dir(self):
+        return os.path.join(self.root, "tmp")
+
+
+attachment_store = AttachmentStore()
@@ -1,41 +1,28 @@
 from app.models.task import Task
 from app.models.job import Job
 from app.models.batch import Batch
-from app.models.BatchMember import BatchMember
+from app.repositories.batch_repository import (
+    is_batch_member,
+    get_batches_for_freelancer,
+    get_member_batch_ids
+)
 from app import db
-from app.models.user import User
 
 from app.repositories.freelancer_profile_repository import save_profile, update_profile, get_profile_by_user_id
-from app.repositories.job_repository import fetch_open_jobs as fetch_all_active_jobs
+from app.repositories.job_repository import fetch_jobs_page
 from app.repositories.application_repository import (
-    create_application, get_applications_by_freelancer, get_application
+    create_application, get_applications_by_freelancer, get_application, get_applied_batch_ids
 )
+from app.repositories.skill_repository import profile_skill_ids
+from app.services.recommendation_service import score_batches, select_page
+from app.services.suggestion_cache import suggestion_cache
+from app.utils.skills import clean_skills_input
 from app.models.freelancer_profile import FreelancerProfile
 
 # ============================================================
 #                     PROFILE FUNCTIONS
 # ============================================================
 
-def clean_skills_input(skills):
-    """Ensure skills come as a clean list."""
-    if not skills:
-        return []
-
-    if isinstance(skills, list):
-        return [s.strip() for s in skills if s.strip()]
-
-    if isinstance(skills, str):
-        cleaned = (
-            skills.replace("{", "")
-                  .replace("}", "")
-                  .replace('"', "")
-                  .split(",")
-        )
-        return [s.strip() for s in cleaned if s.strip()]
-
-    return []
-
-
 def create_freelancer_profile(user_id, data):
     existing = get_profile_by_user_id(user_id)
     if existing:
@@ -65,6 +52,7 @@ def create_freelancer_profile(user_id, data):
     )
 
     save_profile(profile)
+    suggestion_cache.invalidate(user_id)
     return True, None
 
 
@@ -116,7 +104,9 @@ def update_freelancer_profile(user_id, data):
 
     clean_data = {field: data.get(field) for field in allowed_fields if field in data}
 
-    return update_profile(user_id, clean_data)
+    result = update_profile(user_id, clean_data)
+    suggestion_cache.invalidate(user_id)
+    return result
 
 
 
@@ -124,9 +114,9 @@ def update_freelancer_profile(user_id, data):
 #                        JOBS
 # ============================================================
 
-def get_active_jobs():
-    jobs = fetch_all_active_jobs()
-    return [job.to_dict() for job in jobs]
+def get_active_jobs(limit, cursor=None):
+    jobs, next_cursor = fetch_jobs_page(limit, cursor, status="open")
+    return [job.to_dict() for job in jobs], next_cursor
 
 
 
@@ -134,41 +124,43 @@ def get_active_jobs():
 #                SUGGESTED BATCHES
 # ============================================================
 
-def get_suggested_batches(freelancer_id):
-    profile = FreelancerProfile.query.filter_by(user_id=freelancer_id).first()
-    if not profile or not profile.skills:
-        return []
+def get_suggested_batches(freelancer_id, limit=20, cursor=None):
+    """
+    One page of batches recommended for the freelancer, best match first.
+    Returns (batches, next_cursor); next_cursor is None on the last page.
+    """
+    ids, scores = suggestion_cache.get_or_load(freelancer_id, lambda: _score_suggestions(freelancer_id))
+    page, next_cursor = select_page(ids, scores, limit, cursor)
+    if not page:
+        return [], None
+
+    # Only the page itself is loaded and serialized
+    batch_ids = [batch_id for batch_id, _ in page]
+    batches = {b.id: b for b in Batch.query.filter(Batch.id.in_(batch_ids)).all()}
+    applied = get_member_batch_ids(freelancer_id, batch_ids) | get_applied_batch_ids(freelancer_id, batch_ids)
 
-    freelancer_skills = clean_skills_input(profile.skills)
-    freelancer_skills = [s.lower() for s in freelancer_skills]
-
-    batches = Batch.query.all()
     suggested = []
+    for batch_id, score in page:
+        batch = batches.get(batch_id)
+        if batch is None:
+            continue  # deleted since the suggestions were cached (e.g. by another worker)
+        batch_dict = batch.to_dict()
+        batch_dict["already_applied"] = batch_id in applied
+        batch_dict["score"] = score
+        suggested.append(batch_dict)
 
-    freelancer = User.query.get(freelancer_id)
-    freelancer_username = freelancer.username if freelancer else str(freelancer_id)
-
-    for batch in batches:
-        if not batch.skills_required:
-            continue
-
-        batch_skills = [s.strip().lower() for s in batch.skills_required.split(",")]
-
-        if not any(skill in batch_skills for skill in freelancer_skills):
-            continue
-
-        member_in_batch = any(
-            freelancer_username in member.get_team_members()
-            for member in batch.members
-        )
+    return suggested, next_cursor
 
-        already_applied = member_in_batch or bool(get_application(freelancer_id, batch.id))
 
-        batch_dict = batch.to_dict()
-        batch_dict["already_applied"] = already_applied
-        suggested.append(batch_dict)
+def _score_suggestions(freelancer_id):
+    """Cache loader: ((ids, scores), size) for the freelancer's candidate batches."""
+    profile = FreelancerProfile.query.filter_by(user_id=freelancer_id).first()
+    if not profile or not profile.skills:
+        return ([], []), 0
 
-    return suggested
+    skill_ids = [skill_id for (skill_id,) in profile_skill_ids(profile.id).all()]
+    ids, scores = score_batches(skill_ids, profile.experience_years)
+    return (ids, scores), len(ids)
 
 
 
@@ -182,7 +174,7 @@ def apply_for_batch(freelancer_id, batch_id):
         return None, "Batch not found"
 
     # Already a member
-    if any(str(freelancer_id) in member.get_team_members() for member in batch.members):
+    if is_batch_member(batch_id, freelancer_id):
         return None, "Already applied"
 
     # Already applied
@@ -190,6 +182,7 @@ def apply_for_batch(freelancer_id, batch_id):
         return None, "Already applied"
 
     application = create_application(freelancer_id, batch_id)
+    suggestion_cache.invalidate(freelancer_id)
     return application.to_dict(), None
 
 
@@ -221,31 +214,23 @@ def get_my_tasks(freelancer_id):
 # ============================================================
 
 def get_my_batches(freelancer_id):
-    """Returns all batches where the freelancer is a member."""
-    freelancer = User.query.get(freelancer_id)
-    freelancer_name = freelancer.username.lower() if freelancer else str(freelancer_id).lower()
-
-    batch_memberships = BatchMember.query.all()
-    my_batches = []
-
-    for membership in batch_memberships:
-        team_members = membership.get_team_members()
-
-        member_names = [
-            m["name"].strip().lower()
-            for m in team_members if "name" in m and m["name"]
-        ]
-
-        if freelancer_name in member_names:
-            batch = Batch.query.get(membership.batch_id)
-            if batch:
-                batch_dict = batch.to_dict()
-                batch_dict.update({
-                    "manager_id": membership.manager_id,
-                    "batch_member_id": membership.id,
-                    "joined_at": membership.created_at.isoformat() if membership.created_at else None,
-                    "team_members": [m.get("name") for m in team_members]
-                })
-                my_batches.append(batch_dict)
-
-    return my_batches
+    """Returns all batches where the freelancer is a member (one query)."""
+    my_batches = {}
+
+    for batch, manager_id, membership_id, joined_at, teammate in get_batches_for_freelancer(freelancer_id):
+        # A freelancer added by several managers appears once, under the earliest membership
+        batch_dict = my_batches.get(batch.id)
+        if batch_dict is None:
+            batch_dict = batch.to_dict()
+            batch_dict.update({
+                "manager_id": manager_id,
+                "batch_member_id": membership_id,
+                "joined_at": joined_at.isoformat() if joined_at else None,
+                "team_members": []
+            })
+            my_batches[batch.id] = batch_dict
+
+        if batch_dict["batch_member_id"] == membership_id and teammate not in batch_dict["team_members"]:
+            batch_dict["team_members"].append(teammate)
+
+    return list(my_batches.values())
@@ -1,6 +1,7 @@
 from datetime import datetime
 from app.models import JobInvoice, JobInvoiceItem, Job, Task
 from app import db
+from app.utils.pagination import keyset_page
 
 
 # ───────────────────────────────
@@ -160,16 +161,17 @@ def get_freelancer_work_summary(freelancer_id):
 # ───────────────────────────────
 #  MANAGER FUNCTIONS
 # ───────────────────────────────
-def list_invoices(manager_id):
-    """List all invoices belonging to projects managed by this manager."""
-    invoices = (
+def list_invoices(manager_id, limit, cursor=None):
+    """One page of invoices on projects managed by this manager, newest first."""
+    query = (
         JobInvoice.query
         .join(Job, Job.id == JobInvoice.job_id)
         .filter(Job.manager_id == manager_id)
-        .order_by(JobInvoice.created_at.desc())
-        .all()
     )
-    return [inv.to_dict() for inv in invoices]
+    invoices, next_cursor = keyset_page(
+        query, [JobInvoice.created_at, JobInvoice.id], limit, cursor, descending=True
+    )
+    return [inv.to_dict() for inv in invoices], next_cursor
 
 
 def get_invoice_by_id_for_manager(invoice_id, manager_id):
@@ -202,6 +204,8 @@ def update_invoice_status(invoice_id, new_status):
 # ───────────────────────────────
 #  ADMIN FUNCTIONS
 # ───────────────────────────────
-def list_all_invoices():
-    invoices = JobInvoice.query.order_by(JobInvoice.created_at.desc()).all()
-    return [inv.to_dict() for inv in invoices]
+def list_all_invoices(limit, cursor=None):
+    invoices, next_cursor = keyset_page(
+        JobInvoice.query, [JobInvoice.created_at, JobInvoice.id], limit, cursor, descending=True
+    )
+    return [inv.to_dict() for inv in invoices], next_cursor
@@ -4,8 +4,14 @@ from app.models.job import Job
 from app.repositories.job_repository import (
     save_job,
     fetch_all_jobs,
-    fetch_open_jobs  # ✅ ADD this
+    fetch_open_jobs,  # ✅ ADD this
+    get_job_attachment_meta,
+    read_job_attachment
 )
+from app.repositories.attachment_repository import list_job_attachments, get_job_attachment
+from app.services.attachment_store import attachment_store
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # bytes read from the database per query
 
 
 def create_job(data, user_id):
@@ -28,4 +34,64 @@ def list_all_jobs():
     return fetch_all_jobs()
 
 def list_open_jobs():
-    return fetch_open_jobs()
\ No newline at end of file
+    return fetch_open_jobs()
+
+
+def get_description_file_meta(job_id, user_id, role):
+    """
+    Metadata of a job's description file, after an access check: admins,
+    the job's manager, and freelancers while the job is open.
+    Raises LookupError when there is no file, PermissionError when not allowed.
+    """
+    meta = get_job_attachment_meta(job_id)
+    if not meta or meta.description_file_size is None:
+        raise LookupError("Description file not found")
+    _check_job_access(meta, user_id, role)
+    return meta
+
+
+def _check_job_access(job, user_id, role):
+    if role == "admin":
+        return
+    if role == "manager" and str(job.manager_id) == str(user_id):
+        return
+    if role == "freelancer" and job.status == "open":
+        return
+    raise PermissionError("Unauthorized")
+
+
+def list_job_files(job_id, user_id, role):
+    """Attachments of a job, after the same access check as the description file."""
+    job = get_job_attachment_meta(job_id)
+    if not job:
+        raise LookupError("Job not found")
+    _check_job_access(job, user_id, role)
+    return [a.to_dict() for a in list_job_attachments(job_id)]
+
+
+def get_job_file(job_id, attachment_id, user_id, role):
+    """
+    One attachment and the path of its stored file, after an access check.
+    Raises LookupError when missing, PermissionError when not allowed.
+    """
+    job = get_job_attachment_meta(job_id)
+    if not job:
+        raise LookupError("Job not found")
+    _check_job_access(job, user_id, role)
+
+    attachment = get_job_attachment(job_id, attachment_id)
+    if not attachment or not attachment_store.exists(attachment.sha256):
+        raise LookupError("Attachment not found")
+    return attachment, attachment_store.path_for(attachment.sha256)
+
+
+def iter_description_file(job_id, start, stop, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """Yields bytes [start, stop) of the file, one SQL slice per chunk."""
+    offset = start
+    while offset < stop:
+        length = min(chunk_size, stop - offset)
+        chunk = read_job_attachment(job_id, offset, length)
+        if not chunk:
+            break
+        yield bytes(chunk)
+        offset += len(chunk)
@@ -1,12 +1,15 @@
 from datetime import datetime
 from dateutil import parser
-from app.repositories.batch_repository import create_batch, get_batch_by_id, assign_freelancers_to_batch, update_batch, get_batch_members
+from app.repositories.batch_repository import create_batch, get_batch_by_id, assign_freelancers_to_batch, update_batch, get_batch_members, load_manager_batches, get_team_members_by_batch
+from app.repositories.job_repository import fetch_full_project
 from app.repositories.task_repository import create_task
 from app.repositories.manager_repository import fetch_dashboard_metrics
 from app.repositories.application_repository import update_application_status
+from app.repositories.skill_repository import sync_batch_skills
+from app.services.suggestion_cache import suggestion_cache
+from app.utils.pagination import keyset_page
 from app.models.batch import Batch
 from app.models.job import Job
-from app.models.BatchMember import BatchMember
 from app.models.user import User
 from app.models.application import Application
 from app import db
@@ -37,16 +40,48 @@ def get_manager_jobs(manager_id):
     ]
 
 
+def get_full_project(manager_id, project_id):
+    """
+    The manager's project with every batch, its team and its tasks
+    (with assignee), or None. Query count does not grow with the task count.
+    """
+    project = fetch_full_project(project_id, manager_id)
+    if not project:
+        return None
+
+    members = get_team_members_by_batch([b.id for b in project.batches])
+
+    batches = []
+    for batch in project.batches:
+        data = batch.to_dict()
+        data["team_members"] = members.get(batch.id, [])
+        data["tasks"] = [t.to_dict(include_freelancer=True) for t in batch.tasks]
+        batches.append(data)
+
+    return {
+        "project": {
+            "job_id": project.id,
+            "title": project.title,
+            "description": project.description,
+            "status": project.status,
+            "skills_required": project.skills_required,
+            "project_type": project.project_type,
+            "created_at": project.created_at.isoformat() if project.created_at else None,
+        },
+        "batches": batches,
+    }
+
+
 # ---------- Tasks ----------
-def get_manager_tasks(manager_id, job_id=None):
+def get_manager_tasks(manager_id, job_id=None, limit=None, cursor=None):
     from app.models.task import Task
 
     query = db.session.query(Task).join(Job, Job.id == Task.job_id).filter(Job.manager_id == manager_id)
     if job_id:
         query = query.filter(Task.job_id == job_id)
 
-    tasks = query.all()
-    return [t.to_dict(include_job=True, include_batch=True, include_freelancer=True) for t in tasks]
+    tasks, next_cursor = keyset_page(query, [Task.id], limit, cursor)
+    return [t.to_dict(include_job=True, include_batch=True, include_freelancer=True) for t in tasks], next_cursor
 
 
 def create_task_for_job(manager_id, data):
@@ -90,7 +125,7 @@ def add_batch(manager_id, data):
         except Exception:
             raise ValueError("Invalid deadline format. Use YYYY-MM-DD or ISO format.")
 
-    return create_batch(
+    batch = create_batch(
         job_id=job.id,
         project_name=job.title,
         project_type=job.project_type if hasattr(job, "project_type") else data.get("project_type"),
@@ -98,28 +133,18 @@ def add_batch(manager_id, data):
         created_by=manager_id,
         skills_required=job.skills_required,
         deadline=deadline_dt
-    ).to_dict()
+    )
+    suggestion_cache.invalidate_all()
+    return batch.to_dict()
 
 def get_manager_batches(manager_id):
-    batches = Batch.query.filter_by(created_by=manager_id).all()
     result = []
 
-    from app.models.task import Task
-
-    for batch in batches:
-        batch_member = BatchMember.query.filter_by(batch_id=batch.id).first()
-        members = []
-
-        if batch_member and batch_member.team_members:
-            # Convert comma-separated string to array of objects
-            members = [
-                {"id": idx + 1, "username": name.strip(), "assigned_count": 0}
-                for idx, name in enumerate(batch_member.team_members.split(","))
-            ]
-
-        total_assigned = sum(t.count for t in Task.query.filter_by(batch_id=batch.id).all())
-        total_assigned = min(total_assigned, batch.count)  # clamp to batch.count
-        remaining_tasks = batch.count - total_assigned
+    for batch, total_assigned, remaining_tasks, team in load_manager_batches(manager_id):
+        members = [
+            {"id": m["id"], "username": m["name"], "assigned_count": m["assigned_count"]}
+            for m in team
+        ]
 
         result.append({
             "id": batch.id,
@@ -137,9 +162,9 @@ def get_manager_batches(manager_id):
     return result
 
 # ---------- Freelancers ----------
-def get_manager_freelancers(manager_id):
-    freelancers = User.query.filter_by(role="freelancer").all()
-    return [f.to_dict() for f in freelancers]
+def get_manager_freelancers(manager_id, limit=None, cursor=None):
+    freelancers, next_cursor = keyset_page(User.query.filter_by(role="freelancer"), [User.id], limit, cursor)
+    return [f.to_dict() for f in freelancers], next_cursor
 
 
 # ---------- Applications ----------
@@ -213,8 +238,12 @@ def edit_batch(manager_id, batch_id, data):
             else:
                 setattr(batch, field, data[field])
 
+    if "skills_required" in data:
+        sync_batch_skills(batch)
+
     try:
         db.session.commit()
+        suggestion_cache.invalidate_all()
         return {"success": True, "batch": batch.to_dict()}
     except SQLAlchemyError as e:
         db.session.rollback()
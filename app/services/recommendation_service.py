@@ -0,0 +1,226 @@
+import base64
+import binascii
+import heapq
+import math
+from datetime import datetime, timezone
+
+from flask import current_app
+
+from app.repositories.batch_repository import load_recommendation_candidates
+
+try:
+    import numpy as np
+except ImportError:  # optional: scoring falls back to plain Python
+    np = None
+
+
+# ============================================================
+#                 BATCH RECOMMENDATIONS
+# ============================================================
+#
+# score = w_skills     * weighted Jaccard(freelancer skills, batch skills), IDF weights
+#       + w_capacity   * share of the batch's units still unassigned
+#       + w_deadline   * 1 / (1 + days_left / horizon), 0 when past or unset
+#       + w_experience * 1 - |seniority - complexity|
+#
+# seniority = min(experience_years, 10) / 10, complexity = min(skills - 1, 4) / 4.
+# Results are ordered by (score desc, batch id asc); cursors encode the last
+# (score, id) of a page, so pages stay consistent while scores are unchanged.
+# Scores are compared as integers (millionths) so cursor equality is exact.
+
+SCORE_SCALE = 1_000_000
+
+
+def encode_cursor(score, batch_id):
+    raw = f"{score}:{batch_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        score, batch_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return int(score), int(batch_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def recommend_batch_ids(skill_ids, experience_years=None, limit=20, cursor=None):
+    """
+    Ranks every batch sharing a skill with `skill_ids` and returns one page:
+    ([(batch_id, score)], next_cursor or None), score in 0..1.
+    """
+    ids, scores = score_batches(skill_ids, experience_years)
+    return select_page(ids, scores, limit, cursor)
+
+
+def score_batches(skill_ids, experience_years=None):
+    """
+    Scores every batch sharing a skill with `skill_ids`.
+    Returns (ids, scores), unsorted; scores are integer millionths.
+    """
+    skill_ids = list(skill_ids)
+    if not skill_ids:
+        return [], []
+
+    batches, links, skill_batch_counts, total_batches = load_recommendation_candidates(skill_ids)
+    if not batches:
+        return [], []
+
+    # IDF weights: rare skills count for more in the overlap
+    idf = {
+        skill_id: math.log(1 + total_batches / count)
+        for skill_id, count in skill_batch_counts.items()
+    }
+    freelancer_skills = set(skill_ids)
+    freelancer_weight = sum(idf.get(s, math.log(1 + total_batches)) for s in freelancer_skills)
+
+    params = _score_params(experience_years)
+    score_all = _score_numpy if np is not None else _score_python
+    return score_all(batches, links, idf, freelancer_skills, freelancer_weight, params)
+
+
+def select_page(ids, scores, limit=20, cursor=None):
+    """Top `limit` of already-scored batches after `cursor`: ([(batch_id, score)], next_cursor)."""
+    if len(ids) == 0:
+        return [], None
+
+    after = decode_cursor(cursor) if cursor else None
+    select_top = _top_numpy if np is not None and not isinstance(ids, list) else _top_python
+    page = select_top(ids, scores, limit + 1, after)
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1][1], page[-1][0])
+    return [(batch_id, score / SCORE_SCALE) for batch_id, score in page], next_cursor
+
+
+def _score_params(experience_years):
+    config = current_app.config
+    return {
+        "w_skills": config["RECOMMEND_WEIGHT_SKILLS"],
+        "w_capacity": config["RECOMMEND_WEIGHT_CAPACITY"],
+        "w_deadline": config["RECOMMEND_WEIGHT_DEADLINE"],
+        "w_experience": config["RECOMMEND_WEIGHT_EXPERIENCE"],
+        "horizon": config["RECOMMEND_DEADLINE_HORIZON_DAYS"],
+        "seniority": min(max(experience_years or 0, 0), 10) / 10,
+        # Whole hours, so deadline scores (and thus cursors) are stable across page requests
+        "now": datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0).timestamp(),
+    }
+
+
+def _deadline_ts(deadline):
+    if deadline is None:
+        return None
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=timezone.utc)  # stored as naive UTC
+    return deadline.timestamp()
+
+
+# ---------- Scoring ----------
+
+def _score_python(batches, links, idf, freelancer_skills, freelancer_weight, params):
+    inter, total, n_skills = {}, {}, {}
+    for batch_id, skill_id in links:
+        weight = idf.get(skill_id, 0.0)
+        total[batch_id] = total.get(batch_id, 0.0) + weight
+        n_skills[batch_id] = n_skills.get(batch_id, 0) + 1
+        if skill_id in freelancer_skills:
+            inter[batch_id] = inter.get(batch_id, 0.0) + weight
+
+    ids, scores = [], []
+    for batch_id, count, assigned, deadline in batches:
+        shared = inter.get(batch_id, 0.0)
+        union = total.get(batch_id, 0.0) + freelancer_weight - shared
+        skills = shared / union if union > 0 else 0.0
+
+        count = count or 0
+        capacity = max(count - (assigned or 0), 0) / count if count > 0 else 0.0
+
+        deadline_score = 0.0
+        ts = _deadline_ts(deadline)
+        if ts is not None:
+            days_left = (ts - params["now"]) / 86400
+            if days_left >= 0:
+                deadline_score = 1 / (1 + days_left / params["horizon"])
+
+        complexity = min(max(n_skills.get(batch_id, 0) - 1, 0), 4) / 4
+        experience = 1 - abs(params["seniority"] - complexity)
+
+        score = (
+            params["w_skills"] * skills
+            + params["w_capacity"] * capacity
+            + params["w_deadline"] * deadline_score
+            + params["w_experience"] * experience
+        )
+        ids.append(batch_id)
+        scores.append(int(round(score * SCORE_SCALE)))
+    return ids, scores
+
+
+def _score_numpy(batches, links, idf, freelancer_skills, freelancer_weight, params):
+    n = len(batches)
+    ids = np.fromiter((b[0] for b in batches), dtype=np.int64, count=n)
+    position = {batch_id: i for i, batch_id in enumerate(ids.tolist())}
+
+    link_pos = np.fromiter((position[b] for b, _ in links), dtype=np.int64, count=len(links))
+    link_weight = np.fromiter((idf.get(s, 0.0) for _, s in links), dtype=np.float64, count=len(links))
+    link_shared = np.fromiter((s in freelancer_skills for _, s in links), dtype=bool, count=len(links))
+
+    inter = np.bincount(link_pos, weights=link_weight * link_shared, minlength=n)
+    total = np.bincount(link_pos, weights=link_weight, minlength=n)
+    n_skills = np.bincount(link_pos, minlength=n)
+    union = total + freelancer_weight - inter
+    skills = np.divide(inter, union, out=np.zeros(n), where=union > 0)
+
+    count = np.fromiter((b[1] or 0 for b in batches), dtype=np.float64, count=n)
+    assigned = np.fromiter((b[2] or 0 for b in batches), dtype=np.float64, count=n)
+    capacity = np.divide(np.clip(count - assigned, 0, None), count, out=np.zeros(n), where=count > 0)
+
+    ts = np.array([_deadline_ts(b[3]) for b in batches], dtype=np.float64)  # None -> nan
+    days_left = (ts - params["now"]) / 86400
+    valid = ~np.isnan(days_left) & (days_left >= 0)
+    deadline_score = np.zeros(n)
+    deadline_score[valid] = 1 / (1 + days_left[valid] / params["horizon"])
+
+    complexity = np.clip(n_skills - 1, 0, 4) / 4
+    experience = 1 - np.abs(params["seniority"] - complexity)
+
+    scores = (
+        params["w_skills"] * skills
+        + params["w_capacity"] * capacity
+        + params["w_deadline"] * deadline_score
+        + params["w_experience"] * experience
+    )
+    return ids, np.rint(scores * SCORE_SCALE).astype(np.int64)
+
+
+# ---------- Top-K selection ----------
+
+def _top_python(ids, scores, k, after):
+    """Bounded heap: O(n log k), never sorts the full candidate list."""
+    candidates = zip(scores, ids)
+    if after is not None:
+        last_score, last_id = after
+        candidates = (
+            (s, i) for s, i in candidates
+            if s < last_score or (s == last_score and i > last_id)
+        )
+    best = heapq.nsmallest(k, candidates, key=lambda c: (-c[0], c[1]))
+    return [(i, s) for s, i in best]
+
+
+def _top_numpy(ids, scores, k, after):
+    """argpartition to the k-th best score, then an exact sort of that slice only."""
+    if after is not None:
+        last_score, last_id = after
+        keep = (scores < last_score) | ((scores == last_score) & (ids > last_id))
+        ids, scores = ids[keep], scores[keep]
+
+    if len(scores) > k:
+        threshold = -np.partition(-scores, k - 1)[k - 1]
+        keep = scores >= threshold  # ties at the threshold are resolved by id below
+        ids, scores = ids[keep], scores[keep]
+
+    order = np.lexsort((ids, -scores))[:k]
+    return [(int(ids[i]), int(scores[i])) for i in order]
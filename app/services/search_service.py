@@ -0,0 +1,35 @@
+from app.models.job import Job
+from app.models.batch import Batch
+from app.repositories.search_repository import search_documents
+
+SEARCH_KINDS = {
+    "all": {"job", "batch"},
+    "jobs": {"job"},
+    "batches": {"batch"},
+}
+
+
+def search(q, kind, limit, cursor, user_id, role):
+    """
+    Ranked full-text search over jobs and batches visible to the caller:
+    admins see everything, managers their own jobs and batches,
+    freelancers open jobs and all batches.
+    Returns (results, next_cursor).
+    """
+    q = (q or "").strip()
+    if not q:
+        raise ValueError("q is required")
+    kinds = SEARCH_KINDS.get(kind or "all")
+    if kinds is None:
+        raise ValueError("type must be one of: all, jobs, batches")
+
+    job_filters, batch_filters = [], []
+    if role == "manager":
+        job_filters.append(Job.manager_id == user_id)
+        batch_filters.append(Batch.created_by == user_id)
+    elif role == "freelancer":
+        job_filters.append(Job.status == "open")
+    elif role != "admin":
+        raise PermissionError("Unauthorized")
+
+    return search_documents(q, kinds, limit, cursor, job_filters, batch_filters)
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class SuggestionCache:
+    """
+    Per-worker LRU of each freelancer's scored batch candidates, so paging
+    through GET /freelancer/batches does not re-run the candidate queries.
+
+    Entries are dropped by the write paths that change suggestions
+    (batch created/edited, application filed, profile edited) and expire
+    after SUGGESTION_CACHE_TTL seconds, which bounds staleness from other
+    workers and from capacity changes. Memory is bounded both by entry
+    count and by the total number of cached candidates.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # freelancer_id -> (value, size, expires_at)
+        self._items = 0
+        self._generation = 0
+        self.max_size = 5000
+        self.max_items = 2000000
+        self.ttl = 300
+        self.reset_stats()
+
+    def init_app(self, app):
+        self.max_size = app.config.get("SUGGESTION_CACHE_SIZE", self.max_size)
+        self.max_items = app.config.get("SUGGESTION_CACHE_MAX_ITEMS", self.max_items)
+        self.ttl = app.config.get("SUGGESTION_CACHE_TTL", self.ttl)
+        self.clear()
+
+    # ---------- Public API ----------
+    def get_or_load(self, freelancer_id, loader):
+        """
+        Returns the cached value, or calls `loader()` -> (value, size) and
+        caches it unless an invalidation ran while it was loading.
+        """
+        with self._lock:
+            entry = self._entries.get(freelancer_id)
+            if entry is not None and entry[2] > time.monotonic():
+                self._entries.move_to_end(freelancer_id)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._drop(freelancer_id)
+            self.misses += 1
+            generation = self._generation
+
+        value, size = loader()
+
+        with self._lock:
+            if generation == self._generation and size <= self.max_items:
+                self._drop(freelancer_id)
+                self._entries[freelancer_id] = (value, size, time.monotonic() + self.ttl)
+                self._items += size
+                while len(self._entries) > self.max_size or self._items > self.max_items:
+                    _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                    self._items -= evicted_size
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, freelancer_id):
+        with self._lock:
+            self._generation += 1
+            self._drop(freelancer_id)
+            self.invalidations += 1
+
+    def invalidate_all(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._items = 0
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._items = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "cached_entries": len(self._entries),
+            "cached_items": self._items,
+        }
+
+    # ---------- Internals ----------
+    def _drop(self, freelancer_id):
+        entry = self._entries.pop(freelancer_id, None)
+        if entry is not None:
+            self._items -= entry[1]
+
+
+suggestion_cache = SuggestionCache()
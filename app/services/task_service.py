@@ -1,6 +1,9 @@
+import heapq
+from dateutil import parser
 from app.repositories import task_repository
 from app.models.job import Job
-from app.repositories.task_repository import get_task_by_id, update_task
+from app.repositories.task_repository import get_task_by_id, update_task, insert_task_rows
+from app.repositories.batch_repository import get_batch_by_id, get_batch_workloads, get_remaining_capacity
 
 def assign_task(data):
     return task_repository.create_task(data)
@@ -44,3 +47,146 @@ def edit_task(manager_id, task_id, data):
 
 def get_task_by_id(task_id):
     return task_repository.get_task_by_id(task_id)
+
+
+# ---------- Distribute batch ----------
+
+def balanced_split(members, units):
+    """
+    Splits `units` across members so their weighted workloads (load / weight)
+    end up as level as their caps allow.
+    members: [{"id", "load", "weight", "cap"}], cap = max extra units or None.
+    Returns {id: units_given}; the sum is less than `units` only when caps run out.
+
+    The common water level is found by bisection, everyone is filled to it,
+    and the few leftover units go one at a time to whoever is lowest
+    (a min-heap on the workload they would have after one more unit).
+    """
+    alloc = {m["id"]: 0 for m in members}
+    open_members = [m for m in members if m["weight"] > 0 and (m["cap"] is None or m["cap"] > 0)]
+    if units <= 0 or not open_members:
+        return alloc
+
+    def room(m, level):
+        need = max(level * m["weight"] - m["load"], 0)
+        return need if m["cap"] is None else min(need, m["cap"])
+
+    low, high = 0.0, max((m["load"] + units) / m["weight"] for m in open_members)
+    for _ in range(60):
+        mid = (low + high) / 2
+        if sum(room(m, mid) for m in open_members) <= units:
+            low = mid
+        else:
+            high = mid
+
+    for m in open_members:
+        alloc[m["id"]] = int(room(m, low))
+
+    remainder = units - sum(alloc.values())
+    heap = [
+        ((m["load"] + alloc[m["id"]] + 1) / m["weight"], m["id"], m)
+        for m in open_members
+        if m["cap"] is None or alloc[m["id"]] < m["cap"]
+    ]
+    heapq.heapify(heap)
+    while remainder > 0 and heap:
+        _, member_id, m = heapq.heappop(heap)
+        alloc[member_id] += 1
+        remainder -= 1
+        if m["cap"] is None or alloc[member_id] < m["cap"]:
+            heapq.heappush(heap, ((m["load"] + alloc[member_id] + 1) / m["weight"], member_id, m))
+
+    return alloc
+
+
+def distribute_batch(manager_id, batch_id, data):
+    """
+    Splits a batch's remaining units across its team, balancing current
+    workload, and creates one task per freelancer in a single bulk insert.
+
+    data (all optional):
+      units        how many units to hand out (default: all remaining)
+      weights      {username: weight}, default 1
+      caps         {username: max total units in this batch}
+      title, description, deadline   applied to every created task
+      dry_run      return the plan without creating tasks
+    """
+    batch = get_batch_by_id(batch_id)
+    if not batch:
+        raise ValueError("Batch not found")
+    if int(batch.created_by) != int(manager_id):
+        raise PermissionError("Unauthorized")
+
+    remaining = get_remaining_capacity(batch_id)
+    try:
+        units = int(data.get("units", remaining))
+    except (TypeError, ValueError):
+        raise ValueError("units must be an integer")
+    if units <= 0 or units > remaining:
+        raise ValueError(f"units must be between 1 and the remaining {remaining}")
+
+    team = get_batch_workloads(batch_id)
+    if not team:
+        raise ValueError("Batch has no team members")
+
+    weights = data.get("weights") or {}
+    caps = data.get("caps") or {}
+    usernames = {username for _, username, _ in team}
+    unknown = sorted((set(weights) | set(caps)) - usernames)
+    if unknown:
+        raise ValueError(f"Not team members of this batch: {', '.join(unknown)}")
+
+    members = []
+    for freelancer_id, username, load in team:
+        try:
+            weight = float(weights.get(username, 1))
+            cap = caps.get(username)
+            cap = None if cap is None else max(int(cap) - load, 0)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid weight or cap for {username}")
+        if weight <= 0:
+            raise ValueError(f"Weight for {username} must be greater than 0")
+        members.append({"id": freelancer_id, "username": username, "load": load, "weight": weight, "cap": cap})
+
+    deadline = None
+    if data.get("deadline"):
+        try:
+            deadline = parser.isoparse(data["deadline"])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid deadline format")
+
+    alloc = balanced_split(members, units)
+    plan = [
+        {"freelancer_id": m["id"], "username": m["username"], "current": m["load"], "assigned": alloc[m["id"]]}
+        for m in members
+    ]
+    distributed = sum(alloc.values())
+    result = {
+        "batch_id": batch_id,
+        "units": distributed,
+        "unassigned": units - distributed,
+        "plan": plan,
+    }
+    if data.get("dry_run") or not distributed:
+        return result
+
+    title = data.get("title") or batch.project_name
+    description = data.get("description") or batch.project_name
+    rows = [
+        {
+            "job_id": batch.job_id,
+            "batch_id": batch_id,
+            "title": title,
+            "description": description,
+            "count": alloc[m["id"]],
+            "status": "pending",
+            "deadline": deadline,
+            "assigned_by": manager_id,
+            "assigned_to": m["id"],
+        }
+        for m in members
+        if alloc[m["id"]] > 0
+    ]
+    created = insert_task_rows(manager_id, batch_id, rows)
+    result["task_ids"] = created["task_ids"]
+    return result
@@ -0,0 +1,43 @@
+import threading
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.repositories.revoked_token_repository import delete_expired_tokens
+from app.repositories.password_reset_otp_repository import delete_expired_otps
+
+
+def prune_expired_tokens(chunk_size=1000):
+    """
+    Removes expired revoked-token rows and expired password-reset OTPs.
+    """
+    return {
+        "revoked_tokens": delete_expired_tokens(chunk_size),
+        "password_reset_otps": delete_expired_otps(chunk_size),
+    }
+
+
+def start_prune_scheduler(app):
+    """
+    Runs prune_expired_tokens every TOKEN_PRUNE_INTERVAL_SECONDS in a daemon
+    thread. Disabled when the interval is 0 (use `flask prune-tokens` from cron instead).
+    """
+    interval = app.config.get("TOKEN_PRUNE_INTERVAL_SECONDS", 0)
+    if not interval:
+        return None
+
+    chunk_size = app.config.get("TOKEN_PRUNE_CHUNK_SIZE", 1000)
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    prune_expired_tokens(chunk_size)
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    print("Token prune failed:", repr(e))
+                finally:
+                    db.session.remove()
+
+    thread = threading.Thread(target=run, name="token-prune", daemon=True)
+    thread.start()
+    return stop
@@ -1,38 +1,22 @@
 from app.models.user import User
 from app.models.password_reset_otp import PasswordResetOTP
-from app.models.revoked_token import RevokedToken
 from app.models import db
+from app.repositories.revoked_token_repository import revoke_token_if_not_exists
 from datetime import datetime, timedelta, timezone
 import random
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.auth.password_hasher import passwords
+from app.auth.auth_utils import generate_tokens, reissue_tokens, generate_access_token
+from app.auth.session_snapshot import user_from_claims
+from app.repositories.user_repository import bump_security_version, has_users
+from app.services.admin_stats import admin_stats
+from app.utils.pagination import keyset_page
 from flask_jwt_extended import (
-    create_access_token,
-    create_refresh_token,
     get_jwt_identity,
     get_jwt,
     decode_token
 )
 
 # ---------------- AUTHENTICATION ----------------
-def generate_tokens(user):
-    identity = str(user.id)
-    claims = {"role": user.role}
-
-    access_token = create_access_token(
-        identity=identity,
-        additional_claims=claims,
-        expires_delta=timedelta(minutes=59)
-    )
-
-    refresh_token = create_refresh_token(
-        identity=identity,
-        additional_claims=claims,
-        expires_delta=timedelta(days=7)
-    )
-
-    return access_token, refresh_token
-
-
 def authenticate_and_generate_tokens(data):
     email = data.get("email")
     password = data.get("password")
@@ -40,9 +24,14 @@ def authenticate_and_generate_tokens(data):
         return {"error": "Email and password are required", "code": 422}
 
     user = User.query.filter_by(email=email).first()
-    if not user or not check_password_hash(user.password, password):
+    if not user or not passwords.verify(user.password, password):
         return {"error": "Invalid credentials", "code": 401}
 
+    # Upgrade hashes made under an older method/cost while we have the plaintext
+    if passwords.needs_rehash(user.password):
+        user.password = passwords.hash(password)
+        db.session.commit()
+
     access_token, refresh_token = generate_tokens(user)
     return {
         "user": {"id": user.id, "username": user.username, "email": user.email, "role": user.role},
@@ -59,47 +48,51 @@ def refresh_tokens():
     if not user_id:
         return {"error": "Invalid or missing user ID", "code": 401}
 
-    user = User.query.get(user_id)
-    if not user:
-        return {"error": "User not found", "code": 404}
+    old_token = get_jwt()
+
+    # Snapshot still current -> rotate straight from the claims, no user lookup
+    session_user = user_from_claims(old_token)
+    if session_user:
+        access_token, refresh_token = reissue_tokens(old_token)
+    else:
+        user = User.query.get(user_id)
+        if not user:
+            return {"error": "User not found", "code": 404}
+        session_user = {"id": user.id, "username": user.username, "email": user.email, "role": user.role}
+        access_token, refresh_token = generate_tokens(user)
 
     # Revoke old refresh token
-    old_jti = get_jwt().get("jti")
-    if old_jti:
-        revoke_token_if_not_exists(old_jti)
+    if old_token.get("jti"):
+        revoke_token_if_not_exists(old_token["jti"], old_token.get("exp"))
 
-    access_token, refresh_token = generate_tokens(user)
     return {
-        "user": {"id": user.id, "username": user.username, "email": user.email, "role": user.role},
+        "user": session_user,
         "access_token": access_token,
         "refresh_token": refresh_token
     }
 
 
 # ---------------- TOKEN REVOCATION ----------------
-def revoke_token_if_not_exists(jti):
-    """
-    Blacklist the token JTI if it does not already exist.
-    """
-    if not RevokedToken.query.filter_by(jti=jti).first():
-        revoked = RevokedToken(jti=jti, revoked_at=datetime.now(timezone.utc))
-        db.session.add(revoked)
-        db.session.commit()
-    return True
-
-
 def logout_user(jwt_data):
     """
     Revoke the access token JTI.
     """
     jti = jwt_data.get("jti")
     if jti:
-        revoke_token_if_not_exists(jti)
+        revoke_token_if_not_exists(jti, jwt_data.get("exp"))
     return True
 
 
+def revoke_refresh_token(refresh_token):
+    """
+    Revoke the refresh token sent alongside a logout request.
+    """
+    decoded = decode_token(refresh_token)
+    return logout_user(decoded)
+
+
 # ---------------- USER MANAGEMENT ----------------
-def signup_user(total_users, data):
+def signup_user(users_exist, data):
     username = data.get("username")
     email = data.get("email")
     password = data.get("password")
@@ -109,20 +102,21 @@ def signup_user(total_users, data):
     if not all([username, email, password, role]):
         return {"error": "Missing required fields", "code": 400}
 
-    if total_users == 0 and role.lower() != "admin":
+    if not users_exist and role.lower() != "admin":
         return {"error": "First user must be an admin", "code": 403}
 
     existing = User.query.filter((User.username == username) | (User.email == email)).first()
     if existing:
         return {"error": "Username or email already exists", "code": 400}
 
-    hashed_pw = generate_password_hash(password)
+    hashed_pw = passwords.hash(password)
     new_user = User(username=username, email=email, password=hashed_pw, role=role)
     if role.lower() == "manager" and manager_type:
         new_user.manager_type = manager_type
 
     db.session.add(new_user)
     db.session.commit()
+    admin_stats.adjust("users", role)
     return {
         "message": "User created successfully",
         "user": {"id": new_user.id, "username": new_user.username, "role": new_user.role},
@@ -134,13 +128,18 @@ def check_session_service(request):
     """
     Check access token validity; if expired, use refresh token to issue new access token.
     """
-    from flask_jwt_extended import verify_jwt_in_request, create_access_token
+    from flask_jwt_extended import verify_jwt_in_request
     try:
         verify_jwt_in_request(optional=True)
         user_id = get_jwt_identity()
         if not user_id:
             return {"error": "Invalid or missing user ID", "code": 401}
 
+        # Warm path: answer from the token's snapshot
+        session_user = user_from_claims(get_jwt())
+        if session_user:
+            return {"user": session_user}
+
         user = User.query.get(user_id)
         if not user:
             return {"error": "User not found", "code": 401}
@@ -163,7 +162,7 @@ def check_session_service(request):
         if not user:
             return {"error": "User not found", "code": 401}
 
-        new_access_token = create_access_token(identity=user_id)
+        new_access_token = generate_access_token(user)
         return {
             "user": {"id": user.id, "username": user.username, "email": user.email, "role": user.role},
             "new_access_token": new_access_token
@@ -200,18 +199,19 @@ def reset_password_service(email, otp, new_password):
     if not otp_record or otp_record.expires_at < datetime.now(timezone.utc):
         return False
 
-    if check_password_hash(user.password, new_password):
+    if passwords.verify(user.password, new_password):
         return "same_password"
 
-    user.password = generate_password_hash(new_password)
+    user.password = passwords.hash(new_password)
     db.session.delete(otp_record)
     db.session.commit()
     return True
 
 
 # ---------------- CRUD ----------------
-def list_all_users_service():
-    return [u.to_dict() for u in User.query.all()]
+def list_all_users_service(limit, cursor=None):
+    users, next_cursor = keyset_page(User.query, [User.id], limit, cursor)
+    return [u.to_dict() for u in users], next_cursor
 
 
 def get_user_by_id_service(user_id):
@@ -227,10 +227,17 @@ def delete_user_service(user_id):
     user = User.query.get(user_id)
     if not user:
         return False
+    role = user.role
+    bump_security_version(user, deleted=True)
     db.session.delete(user)
     db.session.commit()
+    admin_stats.adjust("users", role, -1)
     return True
 
 
 def count_users_service():
     return User.query.count()
+
+
+def has_users_service():
+    return has_users()
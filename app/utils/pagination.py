@@ -0,0 +1,70 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from flask import current_app, request
+from sqlalchemy import DateTime, tuple_
+
+
+# Keyset ("seek") pagination: pages are ordered by a unique key, e.g.
+# (created_at, id) or just id, and the cursor carries the key of the last
+# row served. The next page is a WHERE key > cursor ... LIMIT n, which an
+# index on the key answers directly, so page 1000 costs the same as page 1
+# (OFFSET would scan and discard every earlier row).
+
+
+def page_args(default=None, maximum=None):
+    """(limit, cursor) from the query string; limit is clamped to 1..maximum."""
+    config = current_app.config
+    default = default or config["PAGE_SIZE"]
+    maximum = maximum or config["MAX_PAGE_SIZE"]
+    limit = request.args.get("limit", default, type=int)
+    return max(1, min(limit, maximum)), request.args.get("cursor") or None
+
+
+def encode_cursor(values):
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, columns):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [
+            datetime.fromisoformat(v) if isinstance(c.type, DateTime) and v is not None else v
+            for c, v in zip(columns, values)
+        ]
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_page(query, columns, limit, cursor=None, descending=False):
+    """
+    One page of `query` ordered by `columns` (unique together; end with the
+    primary key), starting after `cursor`. Returns (rows, next_cursor), with
+    next_cursor None on the last page; limit None returns every row.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if len(columns) == 1:
+            key, after = columns[0], values[0]
+        else:
+            key, after = tuple_(*columns), tuple_(*values)
+        query = query.filter(key < after if descending else key > after)
+
+    order = [c.desc() if descending else c.asc() for c in columns]
+    if limit is None:
+        return query.order_by(*order).all(), None
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], c.key) for c in columns])
+    return rows, next_cursor
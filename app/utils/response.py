@@ -1,18 +1,30 @@
 from flask import jsonify
 
-def success_response(message, data=None, code=200):
+def success_response(message, data=None, code=200, **extra):
+    """`extra` keys (e.g. next_cursor) are added to the envelope next to data."""
     response = {
         "success": True,
         "message": message,
     }
     if data is not None:
         response["data"] = data
+    response.update(extra)
     return jsonify(response), code
 
 
-def error_response(message, code=400):
+def list_response(items, next_cursor=None, code=200):
+    """Plain JSON list body for endpoints whose clients expect one; the next page goes in X-Next-Cursor."""
+    response = jsonify(items)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response, code
+
+
+def error_response(message, code=400, data=None):
     response = {
         "success": False,
         "message": message
     }
+    if data is not None:
+        response["data"] = data
     return jsonify(response), code
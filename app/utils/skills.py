@@ -0,0 +1,40 @@
+# Longest skill name the skills / skill_aliases tables accept.
+MAX_SKILL_LENGTH = 100
+
+
+def clean_skills_input(skills):
+    """Ensure skills come as a clean list."""
+    if not skills:
+        return []
+
+    if isinstance(skills, list):
+        return [s.strip() for s in skills if isinstance(s, str) and s.strip()]
+
+    if isinstance(skills, str):
+        cleaned = (
+            skills.replace("{", "")
+                  .replace("}", "")
+                  .replace('"', "")
+                  .split(",")
+        )
+        return [s.strip() for s in cleaned if s.strip()]
+
+    return []
+
+
+def normalize_skill(skill):
+    """Case-folded, whitespace-collapsed form used as the key in the skills table."""
+    return " ".join(skill.split()).casefold()
+
+
+def normalize_skills(skills):
+    """
+    Unique normalized skills from a list or a CSV / "{a,b}" string, in first-seen order.
+    Names longer than MAX_SKILL_LENGTH are dropped (they stay in the CSV display value only).
+    """
+    seen = []
+    for skill in clean_skills_input(skills):
+        key = normalize_skill(skill)
+        if key and len(key) <= MAX_SKILL_LENGTH and key not in seen:
+            seen.append(key)
+    return seen
@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+from app import models  # noqa: F401  (registers every table)
+from app.config import Config
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # A file database, so threads get their own connections to the same data
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(Config, "ATTACHMENT_DIR", str(tmp_path / "attachments"))
+    monkeypatch.setattr(Config, "TOKEN_PRUNE_INTERVAL_SECONDS", 0)
+
+    app = create_app()
+    app.config["TESTING"] = True
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@contextmanager
+def count_statements():
+    """Collects the SQL statements run on the engine inside the block."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
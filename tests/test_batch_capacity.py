@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from app import db
+from app.models.batch import Batch
+from app.models.job import Job
+from app.models.user import User
+from app.repositories.batch_repository import reserve_batch_capacity
+
+
+@pytest.fixture
+def batch(app):
+    manager = User(username="mgr", email="mgr@company.com", password="x", role="manager")
+    db.session.add(manager)
+    db.session.flush()
+    job = Job(title="J", description="d", project_type="annotation", manager_id=manager.id, created_by=manager.id)
+    db.session.add(job)
+    db.session.flush()
+    batch = Batch(job_id=job.id, project_name="J", project_type="annotation", count=25, created_by=manager.id)
+    db.session.add(batch)
+    db.session.commit()
+    return batch
+
+
+def reserve_concurrently(app, batch_id, units, threads):
+    """Runs `threads` reservations of `units` at once, each in its own session. Returns successes."""
+    start = threading.Barrier(threads)
+    results, errors = [], []
+
+    def reserve():
+        with app.app_context():
+            start.wait()
+            try:
+                ok = reserve_batch_capacity(batch_id, units)
+                db.session.commit()
+                results.append(ok)
+            except Exception as e:  # surfaced below, not swallowed
+                db.session.rollback()
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    workers = [threading.Thread(target=reserve) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    return sum(results)
+
+
+def assigned_total(batch_id):
+    db.session.expire_all()
+    return db.session.query(Batch.assigned_total).filter(Batch.id == batch_id).scalar()
+
+
+def test_concurrent_reservations_never_exceed_count(app, batch):
+    successes = reserve_concurrently(app, batch.id, units=1, threads=60)
+
+    assert successes == batch.count
+    assert assigned_total(batch.id) == batch.count
+
+
+def test_concurrent_multi_unit_reservations_stop_at_capacity(app, batch):
+    successes = reserve_concurrently(app, batch.id, units=4, threads=20)
+
+    assert successes == batch.count // 4
+    assert assigned_total(batch.id) == successes * 4
+    assert assigned_total(batch.id) <= batch.count
@@ -0,0 +1,34 @@
+import hashlib
+
+from app import db
+from app.models.job import Job
+from app.repositories.job_repository import backfill_job_attachment_meta, get_job_attachment_meta
+
+
+def add_job(blob, **meta):
+    job = Job(title="J", description="d", project_type="annotation", description_file=blob, **meta)
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+
+def test_backfill_fills_size_and_sha_for_legacy_blobs(app):
+    blob = bytes(range(256)) * 41  # not a multiple of the read size
+    legacy = add_job(blob, description_file_name="spec.pdf")
+    no_file = add_job(None)
+
+    assert backfill_job_attachment_meta(chunk_size=1, read_size=1000) == 1
+
+    meta = get_job_attachment_meta(legacy)
+    assert meta.description_file_size == len(blob)
+    assert meta.description_file_sha256 == hashlib.sha256(blob).hexdigest()
+    assert get_job_attachment_meta(no_file).description_file_size is None
+
+    # Already filled rows are left alone
+    assert backfill_job_attachment_meta() == 0
+
+
+def test_backfill_cli(app):
+    add_job(b"legacy file")
+    result = app.test_cli_runner().invoke(args=["backfill-job-files"])
+    assert "Backfilled file metadata for 1 jobs" in result.output
@@ -0,0 +1,47 @@
+from app import db
+from app.models.job import Job
+from app.models.user import User
+from app.repositories.job_repository import fetch_all_jobs
+
+from conftest import count_statements
+
+
+def add_jobs(creator_id, start, n):
+    managers = [
+        User(username=f"mgr{i}", email=f"mgr{i}@company.com", password="x", role="manager")
+        for i in range(start, start + n)
+    ]
+    db.session.add_all(managers)
+    db.session.flush()
+    db.session.add_all(
+        Job(title=f"J{manager.id}", description="d", project_type="annotation",
+            created_by=creator_id, manager_id=manager.id)
+        for manager in managers
+    )
+    db.session.commit()
+
+
+def listing_statements():
+    db.session.expunge_all()  # nothing pre-loaded in the identity map
+    with count_statements() as statements:
+        jobs = [job.to_dict() for job in fetch_all_jobs()]
+    assert all(job["created_by_username"] == "admin" for job in jobs)
+    assert all(job["manager_username"].startswith("mgr") for job in jobs)
+    return len(jobs), len(statements)
+
+
+def test_listing_statement_count_does_not_grow_with_jobs(app):
+    admin = User(username="admin", email="admin@company.com", password="x", role="admin")
+    db.session.add(admin)
+    db.session.commit()
+    admin_id = admin.id
+
+    add_jobs(admin_id, 0, 1)
+    one_job = listing_statements()
+
+    add_jobs(admin_id, 1, 49)
+    many_jobs = listing_statements()
+
+    assert one_job[0] == 1 and many_jobs[0] == 50
+    assert many_jobs[1] == one_job[1]
+    assert one_job[1] == 1  # jobs, creators and managers in one joined SELECT
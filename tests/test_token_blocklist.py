@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app import db
+from app.auth.token_blocklist import TokenBlocklist
+from app.models.revoked_token import RevokedToken
+from app.repositories.revoked_token_repository import revoke_token_if_not_exists
+
+from conftest import count_statements
+
+
+def revoked_token_queries(statements):
+    return [s for s in statements if "revoked_tokens" in s]
+
+
+@pytest.fixture
+def make_blocklist(app):
+    """A fresh per-worker blocklist, as a second gunicorn worker would have."""
+    def make(sync_interval=3600):
+        blocklist = TokenBlocklist()
+        blocklist.init_app(app)
+        blocklist.sync_interval = sync_interval
+        return blocklist
+    return make
+
+
+def test_init_app_does_not_query(app):
+    with count_statements() as statements:
+        TokenBlocklist().init_app(app)
+    assert statements == []
+
+
+def test_warm_lookups_do_not_query(app, make_blocklist):
+    revoke_token_if_not_exists("revoked-jti")
+    blocklist = make_blocklist()
+
+    # First lookup syncs the Bloom filter once
+    assert blocklist.is_revoked("good-jti") is False
+    assert blocklist.is_revoked("revoked-jti") is True
+
+    with count_statements() as statements:
+        for _ in range(100):
+            assert blocklist.is_revoked("good-jti") is False
+            assert blocklist.is_revoked("revoked-jti") is True
+    assert revoked_token_queries(statements) == []
+
+
+def test_revocation_reaches_other_workers(app, make_blocklist):
+    worker_a = make_blocklist(sync_interval=0)
+    worker_b = make_blocklist(sync_interval=0)
+    assert worker_a.is_revoked("jti-1") is False
+    assert worker_b.is_revoked("jti-1") is False
+
+    revoke_token_if_not_exists("jti-1")
+    worker_a.add("jti-1")  # the revoking worker records it locally
+
+    assert worker_a.is_revoked("jti-1") is True
+    assert worker_b.is_revoked("jti-1") is True
+
+
+def test_ids_committed_out_of_order_are_synced(app, make_blocklist):
+    blocklist = make_blocklist(sync_interval=0)
+    now = datetime.now(timezone.utc)
+
+    # id 2 commits first; the worker syncs past it
+    db.session.add(RevokedToken(id=2, jti="later-id", revoked_at=now))
+    db.session.commit()
+    assert blocklist.is_revoked("later-id") is True
+    assert blocklist._last_synced_id == 2
+
+    # ... then the transaction holding id 1 commits
+    db.session.add(RevokedToken(id=1, jti="earlier-id", revoked_at=now))
+    db.session.commit()
+
+    with count_statements() as statements:
+        blocklist._sync_bloom()
+    assert revoked_token_queries(statements)
+    assert "earlier-id" in blocklist._bloom
+    assert blocklist.is_revoked("earlier-id") is True